@@ -1,5 +1,11 @@
+from gdax.account_cache import AccountCache
+from gdax.book_analytics import BookAnalytics
+from gdax.ledger_store import LedgerStore
+from gdax.order_tracker import OrderTracker
 from gdax.private_client import PrivateClient
+from gdax.product_rules import OrderValidationError, ProductRules
 from gdax.public_client import PublicClient
+from gdax.simulated_exchange import SimulatedExchange
 
 # List of products offered as of 1/23/2018.
 BTC_USD = PublicClient.BTC_USD
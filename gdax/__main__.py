@@ -0,0 +1,5 @@
+import sys
+
+from gdax.export import main
+
+sys.exit(main())
@@ -0,0 +1,244 @@
+import threading
+import time
+from decimal import Decimal
+
+ZERO = Decimal("0")
+
+
+class AccountCache(object):
+    """Local projection of account balances, holds and available funds.
+
+    The cache is seeded from `list_accounts` and projects the effect of
+    orders placed and canceled through a PrivateClient, and of fills applied
+    with `update`, so pre-trade checks do not need a round trip. Fees are
+    projected at `fee_rate`, which is also added to the hold of buy orders as
+    the exchange does. The cache resyncs from the API every `interval`
+    seconds, and sooner when a discrepancy is found or when an order's hold
+    cannot be projected (e.g. a market buy by size, or an order already
+    done when the response arrives). Orders partly filled on arrival have
+    their fills projected from the response.
+    """
+
+    def __init__(self, client, interval=60, fee_rate="0"):
+        """Create an account cache.
+        Args:
+            client (PrivateClient): Client to read accounts from. The cache
+                registers itself as a listener of the client.
+            interval (Optional[float]): Seconds between resyncs
+            fee_rate (Optional[str]): Fee rate charged on fills. Use your
+                taker rate so the projection never overstates what is
+                available.
+        """
+        self.client = client
+        self.interval = interval
+        self.fee_rate = Decimal(str(fee_rate))
+        self.last_sync = None
+        self.stale = True
+        self._accounts = {}
+        self._orders = {}
+        self._lock = threading.RLock()
+        client.add_listener(self)
+
+    def resync(self):
+        """Reload all accounts from `list_accounts`. If the API returns an
+        error the projection is kept and stays stale.
+        Returns:
+            bool: True if the accounts were reloaded
+        """
+        accounts = self.client.list_accounts()
+        if not isinstance(accounts, list):
+            self.stale = True
+            return False
+        with self._lock:
+            self._accounts = {}
+            for account in accounts:
+                self._load(account)
+            self.stale = False
+            self.last_sync = time.time()
+        return True
+
+    def check(self, account):
+        """Compare a fresh account from the API against the projection. The
+        account replaces the projection, and a full resync is scheduled if
+        they disagree.
+        Args:
+            account (dict): Account as returned by `get_account`
+        Returns:
+            bool: True if the projection matched
+        """
+        with self._lock:
+            cached = self._accounts.get(account["currency"])
+            fresh = self._load(account)
+            if cached is None or cached != fresh:
+                self.stale = True
+                return False
+            return True
+
+    def get(self, currency):
+        """Get the projected account for a currency.
+        Args:
+            currency (str): Currency of the account, e.g. USD
+        Returns:
+            dict: Account with Decimal balance, hold and available, or None
+                if there is no account for the currency
+        """
+        self._refresh()
+        account = self._accounts.get(currency)
+        if account is None:
+            return None
+        return dict(account)
+
+    def balance(self, currency):
+        """Projected balance of the account for a currency."""
+        return self._field(currency, "balance")
+
+    def hold(self, currency):
+        """Projected amount on hold in the account for a currency."""
+        return self._field(currency, "hold")
+
+    def available(self, currency):
+        """Projected available amount in the account for a currency."""
+        return self._field(currency, "available")
+
+    def can_afford(self, currency, amount):
+        """Whether the projected available amount covers an amount.
+        Args:
+            currency (str): Currency of the account
+            amount (str): Amount required
+        Returns:
+            bool: True if enough funds are available
+        """
+        return self.available(currency) >= Decimal(str(amount))
+
+    def order_placed(self, order, params):
+        """Listener callback for orders placed through the client."""
+        if "id" not in order:
+            return
+        if order.get("status") in ("done", "rejected"):
+            # Filled or rejected on arrival; the fills are not known here.
+            self.stale = True
+            return
+        base, quote = params["product_id"].split("-")
+        side = params["side"]
+        price = None
+        if side == "buy":
+            currency = quote
+            if "funds" in params:
+                amount = Decimal(str(params["funds"]))
+            elif "price" in params and params["type"] != "market":
+                price = Decimal(str(params["price"]))
+                amount = (price * Decimal(str(params["size"])) *
+                          (1 + self.fee_rate))
+            else:
+                amount = None
+        else:
+            currency = base
+            amount = Decimal(str(params["size"])) if "size" in params else None
+
+        with self._lock:
+            if amount is None:
+                self.stale = True
+                amount = ZERO
+            projected = self._orders[order["id"]] = {
+                "side": side,
+                "base": base,
+                "quote": quote,
+                "currency": currency,
+                "price": price,
+                "hold": amount,
+            }
+            self._adjust(currency, hold=amount)
+            # Limit orders can be partly filled on arrival and still be open.
+            filled = Decimal(order.get("filled_size") or "0")
+            if filled > 0:
+                self._fill(projected, filled,
+                           Decimal(order.get("executed_value") or "0"))
+
+    def order_canceled(self, order_id):
+        """Listener callback for orders canceled through the client."""
+        self._release(order_id)
+
+    def update(self, message):
+        """Apply a match or done message from the feed to the projection.
+        Messages about orders which were not placed through the client are
+        ignored.
+        Args:
+            message (dict): Message from the websocket feed
+        Returns:
+            bool: True if the projection changed
+        """
+        kind = message.get("type")
+        if kind == "done":
+            return self._release(message.get("order_id"))
+        if kind != "match":
+            return False
+
+        updated = False
+        size = Decimal(message["size"])
+        value = size * Decimal(message["price"])
+        with self._lock:
+            for key in ("maker_order_id", "taker_order_id"):
+                order = self._orders.get(message.get(key))
+                if order is None:
+                    continue
+                self._fill(order, size, value)
+                updated = True
+        return updated
+
+    def _fill(self, order, size, value):
+        fee = value * self.fee_rate
+        if order["side"] == "buy":
+            spent, received, gained = value + fee, order["base"], size
+            if order["price"] is not None:
+                # Limit holds are released at the limit price.
+                released = size * order["price"] * (1 + self.fee_rate)
+            else:
+                released = spent
+        else:
+            spent, received, gained = size, order["quote"], value - fee
+            released = spent
+        released = min(order["hold"], released)
+        order["hold"] -= released
+        self._adjust(order["currency"], balance=-spent, hold=-released)
+        self._adjust(received, balance=gained)
+
+    def _release(self, order_id):
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return False
+            self._adjust(order["currency"], hold=-order["hold"])
+            return True
+
+    def _adjust(self, currency, balance=ZERO, hold=ZERO):
+        account = self._accounts.get(currency)
+        if account is None:
+            self.stale = True
+            return
+        account["balance"] += balance
+        account["hold"] += hold
+        account["available"] = account["balance"] - account["hold"]
+        if account["available"] < 0 or account["hold"] < 0:
+            self.stale = True
+
+    def _load(self, account):
+        loaded = {
+            "id": account["id"],
+            "currency": account["currency"],
+            "balance": Decimal(account["balance"]),
+            "hold": Decimal(account.get("hold", account.get("holds", "0"))),
+            "available": Decimal(account["available"]),
+        }
+        self._accounts[account["currency"]] = loaded
+        return loaded
+
+    def _refresh(self):
+        if (self.stale or self.last_sync is None or
+                time.time() - self.last_sync >= self.interval):
+            self.resync()
+
+    def _field(self, currency, key):
+        account = self.get(currency)
+        if account is None:
+            return ZERO
+        return account[key]
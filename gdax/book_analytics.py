@@ -0,0 +1,231 @@
+def _numpy():
+    # NumPy is optional and slow to import; only load it when it is used.
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("book analytics require numpy")
+    return numpy
+
+
+class BookSide(object):
+    """Cumulative size and notional of one side of an order book, best price
+    first. Queries are binary searches over the cumulative arrays, so they
+    take O(log n) per query and accept arrays of queries at once.
+    """
+
+    def __init__(self, levels, descending=False):
+        """Create a book side.
+        Args:
+            levels (list): Bids or asks from `get_product_order_book` at
+                level 2 or 3, best price first
+            descending (Optional[bool]): True for bids
+        """
+        np = _numpy()
+        self.np = np
+        self.descending = descending
+        self.prices = np.array([row[0] for row in levels], dtype=float)
+        sizes = np.array([row[1] for row in levels], dtype=float)
+        # Prefixed with 0 so index i holds the totals of the first i levels.
+        self.cum_size = np.concatenate(([0.0], np.cumsum(sizes)))
+        self.cum_notional = np.concatenate(([0.0],
+                                            np.cumsum(sizes * self.prices)))
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def best(self):
+        return self.prices[0] if len(self.prices) else self.np.nan
+
+    @property
+    def total_size(self):
+        return self.cum_size[-1]
+
+    def notional_for_size(self, size):
+        """Quote amount needed to fill a size against this side.
+        Args:
+            size (float or array): Amount of base currency
+        Returns:
+            float or array: Notional, or nan where the book is too shallow
+        """
+        np = self.np
+        size = np.asarray(size, dtype=float)
+        i = np.searchsorted(self.cum_size, size, side="left")
+        level = np.clip(i - 1, 0, max(len(self.prices) - 1, 0))
+        prev = np.clip(i - 1, 0, None)
+        notional = (self.cum_notional[prev] +
+                    (size - self.cum_size[prev]) * self.prices[level]
+                    if len(self.prices) else np.full(size.shape, np.nan))
+        return np.where(i > len(self.prices), np.nan, notional)
+
+    def vwap(self, size):
+        """Average fill price for a size.
+        Args:
+            size (float or array): Amount of base currency
+        Returns:
+            float or array: Average price, or nan where the book is too
+                shallow
+        """
+        size = self.np.asarray(size, dtype=float)
+        return self.notional_for_size(size) / size
+
+    def size_for_funds(self, funds):
+        """Base amount filled by spending an amount of quote currency.
+        Args:
+            funds (float or array): Amount of quote currency
+        Returns:
+            float or array: Size, or nan where the book is too shallow
+        """
+        np = self.np
+        funds = np.asarray(funds, dtype=float)
+        i = np.searchsorted(self.cum_notional, funds, side="left")
+        level = np.clip(i - 1, 0, max(len(self.prices) - 1, 0))
+        prev = np.clip(i - 1, 0, None)
+        size = (self.cum_size[prev] +
+                (funds - self.cum_notional[prev]) / self.prices[level]
+                if len(self.prices) else np.full(funds.shape, np.nan))
+        return np.where(i > len(self.prices), np.nan, size)
+
+    def price_for_funds(self, funds):
+        """Average fill price when spending an amount of quote currency.
+        Args:
+            funds (float or array): Amount of quote currency
+        Returns:
+            float or array: Average price, or nan where the book is too
+                shallow
+        """
+        funds = self.np.asarray(funds, dtype=float)
+        return funds / self.size_for_funds(funds)
+
+    def depth(self, price):
+        """Size resting at prices at least as good as a limit price.
+        Args:
+            price (float or array): Limit price
+        Returns:
+            float or array: Cumulative size up to and including the price
+        """
+        np = self.np
+        price = np.asarray(price, dtype=float)
+        if self.descending:
+            # Search the negated prices so they are in ascending order.
+            i = np.searchsorted(-self.prices, -price, side="right")
+        else:
+            i = np.searchsorted(self.prices, price, side="right")
+        return self.cum_size[i]
+
+
+class BookAnalytics(object):
+    """Fill price, slippage and depth estimates for an order book snapshot.
+
+    Buys are filled against the asks and sells against the bids. Every query
+    accepts a single value or an array of values. Sizes and prices are
+    floats, so results are estimates rather than exact amounts.
+    """
+
+    def __init__(self, book):
+        """Create analytics for an order book.
+        Args:
+            book (dict): Result of `get_product_order_book` at level 2 or 3
+        """
+        self.bids = BookSide(book["bids"], descending=True)
+        self.asks = BookSide(book["asks"])
+        self.sequence = book.get("sequence")
+
+    def _side(self, side):
+        assert side in ("buy", "sell")
+        return self.asks if side == "buy" else self.bids
+
+    @property
+    def mid(self):
+        return (self.bids.best + self.asks.best) / 2.0
+
+    @property
+    def spread(self):
+        return self.asks.best - self.bids.best
+
+    def vwap(self, side, size):
+        """Average fill price of a market order for a size.
+        Args:
+            side (str): buy or sell
+            size (float or array): Amount of base currency
+        """
+        return self._side(side).vwap(size)
+
+    def price_for_funds(self, side, funds):
+        """Average fill price of a market order for an amount of funds.
+        Args:
+            side (str): buy or sell
+            funds (float or array): Amount of quote currency
+        """
+        return self._side(side).price_for_funds(funds)
+
+    def slippage(self, side, size=None, funds=None):
+        """Cost of a market order relative to the mid price, in basis points.
+        Args:
+            side (str): buy or sell
+            size (Optional[float or array]): Amount of base currency
+            funds (Optional[float or array]): Amount of quote currency
+        """
+        if size is not None:
+            price = self.vwap(side, size)
+        else:
+            assert funds is not None
+            price = self.price_for_funds(side, funds)
+        return self._bps(side, price)
+
+    def _bps(self, side, price):
+        sign = 1.0 if side == "buy" else -1.0
+        return sign * (price / self.mid - 1.0) * 10000.0
+
+    def depth(self, bps):
+        """Size resting within a distance of the mid price.
+        Args:
+            bps (float or array): Distance from the mid in basis points
+        Returns:
+            tuple: (bid size, ask size)
+        """
+        np = self.bids.np
+        offset = self.mid * np.asarray(bps, dtype=float) / 10000.0
+        return (self.bids.depth(self.mid - offset),
+                self.asks.depth(self.mid + offset))
+
+    def imbalance(self, bps=None):
+        """Imbalance between bid and ask size, from -1 (all asks) to 1 (all
+        bids).
+        Args:
+            bps (Optional[float or array]): Only count size within this
+                distance of the mid. Counts the whole book when not given.
+        """
+        if bps is None:
+            bid, ask = self.bids.total_size, self.asks.total_size
+        else:
+            bid, ask = self.depth(bps)
+        return (bid - ask) / (bid + ask)
+
+
+def batch(books, side, sizes=None, funds=None):
+    """Estimate fills for many sizes or amounts of funds across many
+    products in one call.
+    Args:
+        books (dict): Order book snapshot, or BookAnalytics, for each product
+        side (str): buy or sell
+        sizes (Optional[list]): Amounts of base currency
+        funds (Optional[list]): Amounts of quote currency
+    Returns:
+        dict: For each product, a dict of `price` and `slippage` arrays with
+            one entry per size or amount of funds
+    """
+    results = {}
+    for product_id, book in books.items():
+        if not isinstance(book, BookAnalytics):
+            book = BookAnalytics(book)
+        if sizes is not None:
+            price = book.vwap(side, sizes)
+        else:
+            assert funds is not None
+            price = book.price_for_funds(side, funds)
+        results[product_id] = {
+            "price": price,
+            "slippage": book._bps(side, price),
+        }
+    return results
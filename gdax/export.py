@@ -0,0 +1,448 @@
+"""Bulk export of market and account data to CSV, JSON Lines or Parquet.
+
+Run as ``python -m gdax``. Every exporter yields one API page at a time and
+each page is handed straight to a streaming writer, so memory use does not
+grow with the size of the range exported. Parquet support needs pyarrow,
+which is only imported when Parquet output is requested.
+"""
+import argparse
+import calendar
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+
+import requests
+
+from gdax.private_client import PrivateClient
+from gdax.public_client import PublicClient
+
+# The API returns at most this many candles per request.
+MAX_CANDLES = 300
+
+FIELDS = {
+    "candles": ["product_id", "time", "low", "high", "open", "close",
+                "volume"],
+    "trades": ["product_id", "trade_id", "time", "price", "size", "side"],
+    "book": ["product_id", "sequence", "snapshot_time", "side", "price",
+             "size", "num_orders", "order_id"],
+    "ledger": ["account_id", "id", "created_at", "amount", "balance", "type",
+               "order_id", "trade_id", "product_id"],
+}
+
+# Column types used for Parquet output. Columns not listed are strings, as
+# the API returns prices and sizes as strings to keep their precision.
+TYPES = {
+    "candles": {"time": "int64", "low": "float64", "high": "float64",
+                "open": "float64", "close": "float64", "volume": "float64"},
+    "trades": {"trade_id": "int64"},
+    "book": {"sequence": "int64", "num_orders": "int64"},
+    "ledger": {},
+}
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def parse_time(value):
+    """Convert an ISO 8601 date or time, or epoch seconds, to epoch seconds.
+    Args:
+        value (str): Time to convert
+    Returns:
+        float: Seconds since the epoch, including any fraction of a second
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    value, _, fraction = value.rstrip("Z").partition(".")
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            seconds = calendar.timegm(
+                datetime.strptime(value, fmt).timetuple())
+        except ValueError:
+            continue
+        if fraction:
+            if not fraction.isdigit():
+                break
+            seconds += float("0." + fraction)
+        return seconds
+    raise ValueError("invalid time: {}".format(value))
+
+
+def iso(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def _check(page):
+    if isinstance(page, dict) and "message" in page:
+        raise RuntimeError(page["message"])
+    return page
+
+
+# Exporters. Each yields lists of rows, one per API page.
+
+def export_candles(client, product_id, start, end, granularity=60):
+    """Yield candles for a product from start up to but excluding end,
+    oldest first.
+    Args:
+        client (PublicClient): Client to fetch with
+        product_id (str): ID of the product
+        start (str): Start time in ISO 8601 or epoch seconds
+        end (str): End time in ISO 8601 or epoch seconds
+        granularity (Optional[int]): Candle width in seconds
+    """
+    start, end = parse_time(start), parse_time(end)
+    granularity = int(granularity)
+    last = start - 1
+    while start < end:
+        stop = min(start + MAX_CANDLES * granularity, end)
+        page = _check(client.get_historic_rates(product_id, iso(start),
+                                                iso(stop), granularity))
+        rows = []
+        for candle in sorted(page):
+            if last < candle[0] < end:
+                rows.append(dict(zip(FIELDS["candles"], [product_id] +
+                                     list(candle))))
+                last = candle[0]
+        if rows:
+            yield rows
+        start = stop
+
+
+def export_trades(client, product_id, start=None, limit=100):
+    """Yield trades for a product, newest first, back to a start time.
+    Args:
+        client (PublicClient): Client to fetch with
+        product_id (str): ID of the product
+        start (Optional[str]): Oldest trade time to export. Exports all
+            available trades when not given.
+        limit (Optional[int]): Trades per request
+    """
+    start = parse_time(start) if start is not None else None
+    after = None
+    while True:
+        page = _check(client.get_trades(product_id, after=after, limit=limit))
+        rows = []
+        for trade in page:
+            if start is not None and parse_time(trade["time"]) < start:
+                break
+            row = dict(trade)
+            row["product_id"] = product_id
+            rows.append(row)
+        if rows:
+            yield rows
+        if len(rows) < len(page) or len(page) < limit:
+            return
+        after = min(trade["trade_id"] for trade in page)
+
+
+def export_book(client, product_id, level=2, count=1, interval=0):
+    """Yield order book snapshots for a product.
+    Args:
+        client (PublicClient): Client to fetch with
+        product_id (str): ID of the product
+        level (Optional[int]): Level of the order book, 2 or 3
+        count (Optional[int]): Number of snapshots to take
+        interval (Optional[float]): Seconds between snapshots
+    """
+    for i in range(count):
+        if i:
+            time.sleep(interval)
+        snapshot_time = iso(time.time())
+        book = _check(client.get_product_order_book(product_id, level))
+        rows = []
+        for side, key in (("buy", "bids"), ("sell", "asks")):
+            for entry in book[key]:
+                row = {
+                    "product_id": product_id,
+                    "sequence": book["sequence"],
+                    "snapshot_time": snapshot_time,
+                    "side": side,
+                    "price": entry[0],
+                    "size": entry[1],
+                }
+                if level == 3:
+                    row["order_id"] = entry[2]
+                else:
+                    row["num_orders"] = entry[2]
+                rows.append(row)
+        yield rows
+
+
+def export_ledger(client, account_id, limit=100):
+    """Yield the full ledger of an account, newest first.
+    Args:
+        client (PrivateClient): Client to fetch with
+        account_id (str): ID of the account
+        limit (Optional[int]): Entries per request
+    """
+    after = None
+    while True:
+        page = _check(client.get_account_history(account_id, after=after,
+                                                 limit=limit))
+        rows = []
+        for entry in page:
+            row = dict(entry)
+            row.update(row.pop("details", None) or {})
+            row["account_id"] = account_id
+            rows.append(row)
+        if rows:
+            yield rows
+        if len(page) < limit:
+            return
+        after = min(int(entry["id"]) for entry in page)
+
+
+# Writers. Each accepts rows in chunks and writes them as they arrive.
+
+class CsvWriter(object):
+
+    def __init__(self, path, fields):
+        # The csv module writes its own line endings; it needs a binary file
+        # on Python 2 and untranslated newlines on Python 3.
+        if sys.version_info[0] < 3:
+            self.file = open(path, "wb")
+        else:
+            self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fields, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter(object):
+
+    def __init__(self, path, fields):
+        self.file = open(path, "w")
+        self.fields = fields
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps(dict((f, row.get(f)) for f in self.fields)) + "\n"
+            for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter(object):
+    """Writes a row group every `chunk_size` rows. Every column is a string
+    unless `types` gives it an int64 or float64 type, so all row groups share
+    one schema whatever values the first rows happen to hold.
+    """
+
+    def __init__(self, path, fields, chunk_size=10000, types=None):
+        # pyarrow is heavy and optional; only load it when it is used.
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.buffer = []
+        types = types or {}
+        self.casts = [{"int64": int, "float64": float}.get(types.get(f), str)
+                      for f in fields]
+        self.schema = pyarrow.schema(
+            [(f, getattr(pyarrow, types.get(f, "string"))())
+             for f in fields])
+        self.writer = None
+
+    def write(self, rows):
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        columns = {}
+        for f, cast in zip(self.fields, self.casts):
+            columns[f] = [None if row.get(f) is None else cast(row[f])
+                          for row in self.buffer]
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(self.pa.Table.from_pydict(columns,
+                                                          schema=self.schema))
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path, fields, format="csv", chunk_size=10000, types=None):
+    """Open a streaming writer.
+    Args:
+        path (str): Output file
+        fields (list): Columns to write
+        format (Optional[str]): csv, jsonl or parquet
+        chunk_size (Optional[int]): Rows per Parquet row group
+        types (Optional[dict]): Parquet type of the columns which are not
+            strings, int64 or float64
+    """
+    if format == "csv":
+        return CsvWriter(path, fields)
+    if format == "jsonl":
+        return JsonLinesWriter(path, fields)
+    if format == "parquet":
+        return ParquetWriter(path, fields, chunk_size, types)
+    raise ValueError("unknown format: {}".format(format))
+
+
+class ThrottledSession(object):
+    """Session shared by export threads. Requests are spaced to stay under
+    `rate` per second, and each thread reuses its own connection pool.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _wait(self):
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        self._wait()
+        return self._session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        self._wait()
+        return self._session().post(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        self._wait()
+        return self._session().delete(url, **kwargs)
+
+
+def run(kind, exporter, targets, out, format="csv", workers=4,
+        chunk_size=10000):
+    """Export each target to its own file in parallel.
+    Args:
+        kind (str): candles, trades, book or ledger
+        exporter (callable): Called with a target, yields pages of rows
+        targets (list): Product or account IDs
+        out (str): Output directory
+        format (Optional[str]): csv, jsonl or parquet
+        workers (Optional[int]): Number of targets exported at once
+        chunk_size (Optional[int]): Rows per Parquet row group
+    Returns:
+        dict: Number of rows written to each file
+    """
+    if not os.path.isdir(out):
+        os.makedirs(out)
+
+    def export(target):
+        path = os.path.join(out, "{}-{}.{}".format(kind, target, format))
+        count = 0
+        writer = open_writer(path, FIELDS[kind], format, chunk_size,
+                             TYPES[kind])
+        try:
+            for rows in exporter(target):
+                writer.write(rows)
+                count += len(rows)
+        finally:
+            writer.close()
+        return path, count
+
+    pool = ThreadPool(workers)
+    try:
+        return dict(pool.map(export, targets))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m gdax",
+        description="Export GDAX market and account data.")
+    parser.add_argument("--api-url", default="https://api.gdax.com")
+    parser.add_argument("--out", default=".", help="output directory")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="products or accounts exported at once")
+    parser.add_argument("--rate", type=float, default=3,
+                        help="maximum requests per second")
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="rows per Parquet row group")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    candles = commands.add_parser("candles", help="historic rates")
+    candles.add_argument("products", nargs="+")
+    candles.add_argument("--start", required=True)
+    candles.add_argument("--end", required=True)
+    candles.add_argument("--granularity", type=int, default=60,
+                         choices=[60, 300, 900, 3600, 21600, 86400])
+
+    trades = commands.add_parser("trades", help="trade history")
+    trades.add_argument("products", nargs="+")
+    trades.add_argument("--start", help="oldest trade time to export")
+
+    book = commands.add_parser("book", help="order book snapshots")
+    book.add_argument("products", nargs="+")
+    book.add_argument("--level", type=int, choices=[2, 3], default=2)
+    book.add_argument("--count", type=int, default=1)
+    book.add_argument("--interval", type=float, default=60)
+
+    ledger = commands.add_parser(
+        "ledger", help="account history. Credentials are read from "
+        "GDAX_KEY, GDAX_B64SECRET and GDAX_PASSPHRASE")
+    ledger.add_argument("accounts", nargs="*",
+                        help="account IDs (default: all accounts)")
+
+    args = parser.parse_args(argv)
+    session = ThrottledSession(args.rate)
+
+    if args.command == "ledger":
+        client = PrivateClient(os.environ.get("GDAX_KEY", ""),
+                               os.environ.get("GDAX_B64SECRET", ""),
+                               os.environ.get("GDAX_PASSPHRASE", ""),
+                               api_url=args.api_url, session=session)
+        targets = args.accounts or [
+            a["id"] for a in _check(client.list_accounts())]
+        exporter = lambda a: export_ledger(client, a)
+    else:
+        client = PublicClient(api_url=args.api_url, session=session)
+        targets = args.products
+        if args.command == "candles":
+            exporter = lambda p: export_candles(client, p, args.start,
+                                                args.end, args.granularity)
+        elif args.command == "trades":
+            exporter = lambda p: export_trades(client, p, args.start)
+        else:
+            exporter = lambda p: export_book(client, p, args.level,
+                                             args.count, args.interval)
+
+    written = run(args.command, exporter, targets, args.out, args.format,
+                  args.workers, args.chunk_size)
+    for path in sorted(written):
+        print("{}: {} rows".format(path, written[path]))
+    return 0
@@ -0,0 +1,256 @@
+import json
+import sqlite3
+import time
+from decimal import Decimal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    account_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    balance TEXT NOT NULL,
+    type TEXT NOT NULL,
+    order_id TEXT,
+    trade_id TEXT,
+    product_id TEXT,
+    details TEXT,
+    PRIMARY KEY (account_id, id)
+);
+CREATE INDEX IF NOT EXISTS ledger_time ON ledger (account_id, created_at);
+CREATE INDEX IF NOT EXISTS ledger_type ON ledger (account_id, type,
+                                                  created_at);
+CREATE INDEX IF NOT EXISTS ledger_order ON ledger (order_id);
+
+CREATE TABLE IF NOT EXISTS holds (
+    account_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    amount TEXT NOT NULL,
+    type TEXT,
+    ref TEXT,
+    PRIMARY KEY (account_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    account_id TEXT PRIMARY KEY,
+    newest_id INTEGER,
+    oldest_id INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+
+class LedgerStore(object):
+    """Local SQLite copy of the ledger and holds of your accounts.
+
+    Each account has a checkpoint with the newest and oldest entry stored.
+    `sync` fetches only the entries newer than the newest one, then resumes
+    backfilling older history until it reaches the first entry, committing
+    after every page so an interrupted sync picks up where it stopped.
+    """
+
+    def __init__(self, client, path="gdax_ledger.db", page_size=100):
+        """Create or open a ledger store.
+        Args:
+            client (PrivateClient): Client to fetch the ledger with
+            path (Optional[str]): Path of the SQLite database
+            page_size (Optional[int]): Entries to request per page (max 100)
+        """
+        self.client = client
+        self.page_size = page_size
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def checkpoint(self, account_id):
+        """Get the sync checkpoint of an account.
+        Args:
+            account_id (str): ID of the account
+        Returns:
+            dict: newest_id, oldest_id, complete and synced_at, or None if
+                the account has never been synced
+        """
+        row = self.db.execute(
+            "SELECT newest_id, oldest_id, complete, synced_at "
+            "FROM checkpoints WHERE account_id = ?", (account_id,)).fetchone()
+        if row is None:
+            return None
+        return {"newest_id": row[0], "oldest_id": row[1],
+                "complete": bool(row[2]), "synced_at": row[3]}
+
+    def sync(self, account_id, backfill=True):
+        """Fetch ledger entries not yet stored, and replace the stored holds.
+        Stops at the first API error; the pages stored before it are kept
+        and the next sync resumes from them.
+        Args:
+            account_id (str): ID of the account
+            backfill (Optional[bool]): Also fetch history older than the
+                oldest entry stored
+        Returns:
+            int: Number of new ledger entries stored
+        """
+        checkpoint = self.checkpoint(account_id) or {
+            "newest_id": None, "oldest_id": None, "complete": False}
+        newest = checkpoint["newest_id"]
+        oldest = checkpoint["oldest_id"]
+        # An account with nothing stored has no history to backfill from yet,
+        # whatever its checkpoint says.
+        complete = checkpoint["complete"] and oldest is not None
+        count = 0
+
+        while True:
+            if newest is None:
+                page = self.client.get_account_history(
+                    account_id, limit=self.page_size)
+            else:
+                page = self.client.get_account_history(
+                    account_id, before=newest, limit=self.page_size)
+            if not isinstance(page, list):
+                return count
+            ids = self._store(account_id, page)
+            if ids:
+                newest = max(ids + [newest or 0])
+                if oldest is None:
+                    oldest = min(ids)
+            self._checkpoint(account_id, newest, oldest, complete)
+            count += len(ids)
+            if len(page) < self.page_size:
+                break
+
+        while backfill and not complete and oldest is not None:
+            page = self.client.get_account_history(
+                account_id, after=oldest, limit=self.page_size)
+            if not isinstance(page, list):
+                return count
+            ids = self._store(account_id, page)
+            if ids:
+                oldest = min(ids)
+            if len(page) < self.page_size:
+                complete = True
+            self._checkpoint(account_id, newest, oldest, complete)
+            count += len(ids)
+
+        self.sync_holds(account_id)
+        return count
+
+    def sync_holds(self, account_id):
+        """Replace the stored holds of an account with the current ones.
+        The stored holds are left as they are if the API returns an error.
+        Args:
+            account_id (str): ID of the account
+        Returns:
+            bool: True if the holds were replaced
+        """
+        holds = []
+        for page in self.client.iter_holds(account_id, limit=self.page_size):
+            if not isinstance(page, list):
+                return False
+            holds.extend(page)
+        with self.db:
+            self.db.execute("DELETE FROM holds WHERE account_id = ?",
+                            (account_id,))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO holds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(account_id, h["id"], h.get("created_at"),
+                  h.get("updated_at"), h["amount"], h.get("type"),
+                  h.get("ref")) for h in holds])
+        return True
+
+    def entries(self, account_id, type=None, order_id=None, start=None,
+                end=None):
+        """List stored ledger entries, oldest first.
+        Args:
+            account_id (str): ID of the account
+            type (Optional[str]): Only entries of this type, e.g. fee, match,
+                transfer
+            order_id (Optional[str]): Only entries for this order
+            start (Optional[str]): Start time in ISO 8601, inclusive
+            end (Optional[str]): End time in ISO 8601, exclusive
+        Returns:
+            list: Ledger entries in the format returned by the API
+        """
+        where, args = self._where(account_id, type, order_id, start, end)
+        rows = self.db.execute(
+            "SELECT id, created_at, amount, balance, type, details "
+            "FROM ledger WHERE " + where + " ORDER BY id", args)
+        return [{"id": str(row[0]), "created_at": row[1], "amount": row[2],
+                 "balance": row[3], "type": row[4],
+                 "details": json.loads(row[5])} for row in rows]
+
+    def totals(self, account_id, product_id=None, start=None, end=None):
+        """Sum stored ledger amounts by entry type. Fees are the `fee` total
+        and realized trading flow is the `match` total.
+        Args:
+            account_id (str): ID of the account
+            product_id (Optional[str]): Only entries for this product
+            start (Optional[str]): Start time in ISO 8601, inclusive
+            end (Optional[str]): End time in ISO 8601, exclusive
+        Returns:
+            dict: Decimal total for each entry type
+        """
+        where, args = self._where(account_id, None, None, start, end)
+        if product_id is not None:
+            where += " AND product_id = ?"
+            args.append(product_id)
+        totals = {}
+        for type, amount in self.db.execute(
+                "SELECT type, amount FROM ledger WHERE " + where, args):
+            totals[type] = totals.get(type, Decimal(0)) + Decimal(amount)
+        return totals
+
+    def holds(self, account_id):
+        """List the stored holds of an account.
+        Args:
+            account_id (str): ID of the account
+        Returns:
+            list: Holds in the format returned by the API
+        """
+        rows = self.db.execute(
+            "SELECT id, created_at, updated_at, amount, type, ref FROM holds "
+            "WHERE account_id = ?", (account_id,))
+        return [{"id": row[0], "account_id": account_id, "created_at": row[1],
+                 "updated_at": row[2], "amount": row[3], "type": row[4],
+                 "ref": row[5]} for row in rows]
+
+    @staticmethod
+    def _where(account_id, type, order_id, start, end):
+        where = ["account_id = ?"]
+        args = [account_id]
+        if type is not None:
+            where.append("type = ?")
+            args.append(type)
+        if order_id is not None:
+            where.append("order_id = ?")
+            args.append(order_id)
+        if start is not None:
+            where.append("created_at >= ?")
+            args.append(start)
+        if end is not None:
+            where.append("created_at < ?")
+            args.append(end)
+        return " AND ".join(where), args
+
+    def _store(self, account_id, page):
+        rows = []
+        for entry in page:
+            details = entry.get("details") or {}
+            rows.append((account_id, int(entry["id"]), entry["created_at"],
+                         entry["amount"], entry["balance"], entry["type"],
+                         details.get("order_id"), details.get("trade_id"),
+                         details.get("product_id"), json.dumps(details)))
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO ledger "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return [row[1] for row in rows]
+
+    def _checkpoint(self, account_id, newest, oldest, complete):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (account_id, newest, oldest, int(complete), time.time()))
@@ -0,0 +1,305 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+from gdax.export import parse_time
+
+
+class OrderTracker(object):
+    """Local record of the orders placed through a PrivateClient.
+
+    Orders are indexed by id and client_oid so their status can be read from
+    memory instead of polling `list_orders` or `get_order`. The tracker is
+    kept current by feed messages passed to `update`, and is reconciled
+    against `list_orders(status=['all'])` every `interval` seconds. The
+    interval halves whenever reconciliation finds something the feed missed
+    and doubles when it finds nothing, within [min_interval, max_interval].
+    Only the `max_done` most recently finished orders are kept.
+    """
+
+    def __init__(self, client=None, interval=10, min_interval=1,
+                 max_interval=300, max_done=10000):
+        """Create an order tracker.
+        Args:
+            client (Optional[PrivateClient]): Client to track orders for. The
+                tracker registers itself as a listener of the client.
+            interval (Optional[float]): Initial reconciliation interval in
+                seconds
+            min_interval (Optional[float]): Lower bound of the interval
+            max_interval (Optional[float]): Upper bound of the interval
+            max_done (Optional[int]): Number of done orders to keep before
+                the oldest ones are forgotten
+        """
+        self.client = client
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_done = max_done
+        self.last_reconcile = time.time()
+        self._orders = {}
+        self._client_oids = {}
+        self._done_ids = OrderedDict()
+        self._lock = threading.RLock()
+        if client is not None:
+            client.add_listener(self)
+
+    def track(self, order):
+        """Record an order, replacing any previous record with the same id.
+        Args:
+            order (dict): Order as returned by the API
+        """
+        with self._lock:
+            self._orders[order["id"]] = order
+            if order.get("client_oid"):
+                self._client_oids[order["client_oid"]] = order["id"]
+            if order.get("status") == "done":
+                self._retire(order["id"])
+
+    def forget(self, order_id):
+        """Drop an order from the tracker.
+        Args:
+            order_id (str): ID of the order
+        """
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            self._done_ids.pop(order_id, None)
+            if order is not None and order.get("client_oid"):
+                self._client_oids.pop(order["client_oid"], None)
+
+    def order_placed(self, order, params):
+        """Listener callback for orders placed through the client."""
+        if "id" not in order:
+            return
+        order = dict(order)
+        for key in ("client_oid", "product_id", "side", "type"):
+            if key in params:
+                order.setdefault(key, params[key])
+        order.setdefault("status", "pending")
+        order.setdefault("filled_size", "0")
+        order.setdefault("executed_value", "0")
+        self.track(order)
+
+    def order_canceled(self, order_id):
+        """Listener callback for orders canceled through the client."""
+        self._done(order_id, "canceled")
+
+    def get(self, order_id):
+        """Get the tracked state of an order.
+        Args:
+            order_id (str): ID of the order
+        Returns:
+            dict: The tracked order, or None if it is unknown
+        """
+        return self._orders.get(order_id)
+
+    def get_by_client_oid(self, client_oid):
+        """Get the tracked state of an order by the ID selected by you.
+        Args:
+            client_oid (str): Order ID selected by you
+        Returns:
+            dict: The tracked order, or None if it is unknown
+        """
+        order_id = self._client_oids.get(client_oid)
+        if order_id is None:
+            return None
+        return self._orders.get(order_id)
+
+    def status(self, order_id):
+        """Get the status of an order.
+        Args:
+            order_id (str): ID of the order
+        Returns:
+            str: pending, received, open, active or done, or None if it is
+                unknown. received is not an API status; it marks orders the
+                feed has acknowledged before they open or fill.
+        """
+        order = self._orders.get(order_id)
+        if order is None:
+            return None
+        return order.get("status")
+
+    def open_orders(self, product_id=None):
+        """List tracked orders which are not done.
+        Args:
+            product_id (Optional[str]): Only list orders for this product
+        Returns:
+            list: Tracked orders
+        """
+        with self._lock:
+            return [o for o in self._orders.values()
+                    if o.get("status") != "done" and
+                    (product_id is None or o.get("product_id") == product_id)]
+
+    def update(self, message):
+        """Apply a feed message (received, open, match, change or done).
+        Messages about orders which are not tracked are ignored.
+        Args:
+            message (dict): Message from the websocket feed
+        Returns:
+            bool: True if a tracked order was updated
+        """
+        kind = message.get("type")
+        with self._lock:
+            if kind == "match":
+                updated = False
+                for key in ("maker_order_id", "taker_order_id"):
+                    order = self._orders.get(message.get(key))
+                    if order is not None:
+                        self._fill(order, message["size"], message["price"])
+                        updated = True
+                return updated
+
+            order = self._orders.get(message.get("order_id"))
+            if order is None:
+                return False
+            if kind == "received":
+                if order.get("status") == "pending":
+                    order["status"] = "received"
+            elif kind == "open":
+                order["status"] = "open"
+            elif kind == "change":
+                if "new_size" in message:
+                    order["size"] = message["new_size"]
+                if "new_funds" in message:
+                    order["funds"] = message["new_funds"]
+            elif kind == "done":
+                self._done(order["id"], message.get("reason"),
+                           message.get("time"))
+            else:
+                return False
+            return True
+
+    def due(self):
+        """Whether the reconciliation interval has elapsed."""
+        return time.time() - self.last_reconcile >= self.interval
+
+    def maybe_reconcile(self):
+        """Reconcile against the API if the interval has elapsed.
+        Returns:
+            int: Number of orders changed, or None if it was not due or the
+                API returned an error
+        """
+        if not self.due():
+            return None
+        return self.reconcile()
+
+    def reconcile(self, orders=None):
+        """Bring the tracker in line with the API and adjust the interval.
+        Orders are listed newest first, page by page, until every tracked
+        order which is not done has been seen. Those still missing are looked
+        up individually; orders the API reports as not found are marked as
+        canceled. Other errors leave the tracked state as it is, so the next
+        reconciliation retries.
+        Args:
+            orders (Optional[list]): Result of `list_orders(status=['all'])`.
+                Fetched from the client when not given.
+        Returns:
+            int: Number of orders changed, or None if listing orders failed
+                or there is no client to list them with
+        """
+        if orders is None:
+            if self.client is None:
+                return None
+            orders = self._list()
+        if not isinstance(orders, list):
+            return None
+        changed = 0
+        seen = set()
+        with self._lock:
+            for order in orders:
+                seen.add(order["id"])
+                if self._differs(self._orders.get(order["id"]), order):
+                    self.track(self._merge(order))
+                    changed += 1
+            missing = [o["id"] for o in self._orders.values()
+                       if o.get("status") != "done" and o["id"] not in seen]
+
+        for order_id in missing:
+            if self.client is None:
+                break
+            order = self.client.get_order(order_id)
+            if "id" in order:
+                if self._differs(self._orders.get(order_id), order):
+                    self.track(self._merge(order))
+                    changed += 1
+            elif order.get("message") == "NotFound":
+                self._done(order_id, "canceled")
+                changed += 1
+
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2.0)
+        else:
+            self.interval = min(self.max_interval, self.interval * 2.0)
+        self.last_reconcile = time.time()
+        return changed
+
+    def _list(self):
+        with self._lock:
+            pending = set(o["id"] for o in self._orders.values()
+                          if o.get("status") != "done")
+            created = [self._orders[i].get("created_at") for i in pending]
+        # Orders are listed newest first, so nothing older than the oldest
+        # pending order needs to be fetched. Times are compared parsed, as
+        # the API does not pad fractional seconds to a fixed width.
+        oldest = (min(parse_time(c) for c in created)
+                  if created and None not in created else None)
+        orders = []
+        for page in self.client.iter_orders(status=["all"]):
+            if not isinstance(page, list):
+                return None
+            orders.extend(page)
+            pending.difference_update(o["id"] for o in page)
+            if not pending or not page:
+                break
+            if (oldest is not None and page[-1].get("created_at") and
+                    parse_time(page[-1]["created_at"]) < oldest):
+                break
+        return orders
+
+    def _retire(self, order_id):
+        self._done_ids.pop(order_id, None)
+        self._done_ids[order_id] = True
+        while len(self._done_ids) > self.max_done:
+            self.forget(next(iter(self._done_ids)))
+
+    def _merge(self, order):
+        old = self._orders.get(order["id"])
+        if old is None:
+            return order
+        merged = dict(old)
+        merged.update(order)
+        return merged
+
+    @staticmethod
+    def _differs(old, new):
+        if old is None:
+            return True
+        for key in ("status", "done_reason", "size"):
+            if key in new and old.get(key) != new[key]:
+                return True
+        for key in ("filled_size", "executed_value"):
+            if key in new and Decimal(old.get(key, "0")) != Decimal(new[key]):
+                return True
+        return False
+
+    def _fill(self, order, size, price):
+        size = Decimal(size)
+        order["filled_size"] = str(Decimal(order.get("filled_size", "0")) +
+                                   size)
+        order["executed_value"] = str(
+            Decimal(order.get("executed_value", "0")) + size * Decimal(price))
+        if order.get("status") in ("pending", "received"):
+            order["status"] = "active"
+
+    def _done(self, order_id, reason, done_at=None):
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return
+            order["status"] = "done"
+            if reason is not None:
+                order["done_reason"] = reason
+            if done_at is not None:
+                order["done_at"] = done_at
+            self._retire(order_id)
@@ -9,13 +9,49 @@ from gdax.public_client import PublicClient
 class PrivateClient(PublicClient):
     """Authenticated client for accessing GDAX accounts. requires passphrase,
     key, and b64secret key to access your accounts.
+
+    If product_rules is given, the price, size and funds of every order are
+    checked and rounded locally before the order is sent.
+
+    Requests are sent through session, which defaults to the requests module.
+    Any object with requests-style get, post and delete methods can be used,
+    such as a requests.Session or a SimulatedExchange.
     """
 
     def __init__(self, key, b64secret, passphrase,
-                 api_url="https://api.gdax.com", timeout=30):
+                 api_url="https://api.gdax.com", timeout=30,
+                 product_rules=None, session=None):
         self.url = api_url.rstrip('/')
         self.timeout = timeout
+        self.session = session if session is not None else requests
         self.auth = CoinbaseExchangeAuth(key, b64secret, passphrase)
+        self.product_rules = product_rules
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """Register an object to be notified of orders placed and canceled
+        through this client. The listener must implement
+        `order_placed(order, params)` and `order_canceled(order_id)`.
+        Args:
+            listener (object): Listener to notify
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop notifying a previously registered listener.
+        Args:
+            listener (object): Listener to remove
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify_canceled(self, r, order_ids):
+        if r.status_code != 200:
+            return
+        for order_id in order_ids:
+            for listener in self.listeners:
+                listener.order_canceled(order_id)
 
     def list_accounts(self):
         """Get a list of trading accounts
@@ -40,8 +76,8 @@ class PrivateClient(PublicClient):
                 ]
         """
 
-        r = requests.get(self.url + '/accounts', auth=self.auth,
-                         timeout=self.timeout)
+        r = self.session.get(self.url + '/accounts', auth=self.auth,
+                             timeout=self.timeout)
         return r.json()
 
     def get_account(self, account_id):
@@ -59,15 +95,31 @@ class PrivateClient(PublicClient):
                     "currency": "USD"
                 }
         """
-        r = requests.get(self.url + '/accounts/' + account_id, auth=self.auth,
-                         timeout=self.timeout)
+        r = self.session.get(self.url + '/accounts/' + account_id,
+                             auth=self.auth, timeout=self.timeout)
+        return r.json()
+
+    def _paginated(self, path, before=None, after=None, limit=None):
+        params = {}
+        if before is not None:
+            params["before"] = before
+        if after is not None:
+            params["after"] = after
+        if limit is not None:
+            params["limit"] = limit
+        r = self.session.get(self.url + path, auth=self.auth, params=params,
+                             timeout=self.timeout)
         return r.json()
 
-    def get_account_history(self, account_id):
+    def get_account_history(self, account_id, before=None, after=None,
+                            limit=None):
         """List account activity. Account activity either increases or decreases
         your account balance. Items are paginated and sorted latest first.
         Args:
             account_id (str): ID of the account
+            before (Optional[str]): Return entries newer than this entry ID
+            after (Optional[str]): Return entries older than this entry ID
+            limit (Optional[int]): Number of entries per page (max 100)
         Returns:
             list: A list of account activity. Example response::
                 [
@@ -85,19 +137,19 @@ class PrivateClient(PublicClient):
                     }
                 ]
         """
-        r = requests.get(self.url +
-                         '/accounts/{}/ledger'.format(str(account_id)),
-                         auth=self.auth, timeout=self.timeout)
-        # TODO: pagination
-        return r.json()
+        return self._paginated('/accounts/{}/ledger'.format(str(account_id)),
+                               before, after, limit)
 
-    def get_holds(self, account_id):
+    def get_holds(self, account_id, before=None, after=None, limit=None):
         """Holds are placed on an account for any active orders or pending
         withdraw requensts. As an order is filled, the hold amount is updated.
         If an order is canceled, any remaining hold is removed. For a withdraw,
         once it is completed, the hold is removed.
         Args:
             account_id (str): ID of the account
+            before (Optional[str]): Pagination cursor for newer holds
+            after (Optional[str]): Pagination cursor for older holds
+            limit (Optional[int]): Number of holds per page (max 100)
         Returns:
             list: A list of account holds. Example response::
                 [
@@ -112,11 +164,21 @@ class PrivateClient(PublicClient):
                     }
                 ]
         """
-        r = requests.get(self.url +
-                         '/accounts/{}/holds'.format(str(account_id)),
-                         auth=self.auth, timeout=self.timeout)
-        # TODO: pagination
-        return r.json()
+        return self._paginated('/accounts/{}/holds'.format(str(account_id)),
+                               before, after, limit)
+
+    def iter_holds(self, account_id, limit=100):
+        """Page through the holds of an account, newest first, following the
+        CB-AFTER cursor of each page.
+        Args:
+            account_id (str): ID of the account
+            limit (Optional[int]): Number of holds per page (max 100)
+        Returns:
+            generator: Pages of holds as returned by get_holds. An error
+                response is yielded as is and ends the iteration.
+        """
+        return self._pages('/accounts/{}/holds'.format(str(account_id)),
+                           {"limit": limit})
 
     def _order(self, **kwargs):
         """You can place different orders: limit, market, and stop. Orders can
@@ -124,10 +186,20 @@ class PrivateClient(PublicClient):
         placed, your account funds will be put on hold for the duration of the
         order. How much and which funds are put on hold depends on the order
         type and parameters specified.
-        
+
+        Raises:
+            OrderValidationError: If product_rules is set and the order
+                violates them
         """
-        return requests.post(self.url + '/orders', data=json.dumps(kwargs),
-                          auth=self.auth, timeout=self.timeout)
+        if self.product_rules is not None:
+            kwargs = self.product_rules.normalize_order(kwargs)
+        r = self.session.post(self.url + '/orders', data=json.dumps(kwargs),
+                              auth=self.auth, timeout=self.timeout)
+        if self.listeners and r.status_code == 200:
+            order = r.json()
+            for listener in self.listeners:
+                listener.order_placed(order, kwargs)
+        return r
 
     def limit_buy(self, product_id, price, size, client_oid=None, stp=None,
                   time_in_force="GTC", cancel_after=None, post_only="True"):
@@ -348,8 +420,9 @@ class PrivateClient(PublicClient):
         Args:
             order_id (str): ID of the order previously placed
         """
-        r = requests.delete(self.url + '/orders/' + order_id, auth=self.auth,
-                            timeout=self.timeout)
+        r = self.session.delete(self.url + '/orders/' + order_id,
+                                auth=self.auth, timeout=self.timeout)
+        self._notify_canceled(r, [order_id])
         return r.json()
 
     def cancel_all(self, product_id=None):
@@ -364,18 +437,25 @@ class PrivateClient(PublicClient):
         url = self.url + '/orders/'
         if product_id is not None:
             url += "?product_id={}&".format(str(product_id))
-        r = requests.delete(url, auth=self.auth, timeout=self.timeout)
+        r = self.session.delete(url, auth=self.auth, timeout=self.timeout)
+        if self.listeners:
+            self._notify_canceled(r, r.json())
         return r.json()
 
-    def list_orders(self, product_id=None, status=[]):
+    def list_orders(self, product_id=None, status=[], after=None,
+                    limit=None):
         """List your current open orders. Only open or un-settled orders are
         returned. As soon as an order is no longer open and settled, it will no
-        longer appear in the default request.
+        longer appear in the default request. Returns a single page; use
+        iter_orders to page through all of them.
         Args:
             status (Optional[list]): Limit list of orders to these statuses
                 [open, pending, active]. Passing all returns orders of all
                 statuses.
             product_id (Optional[str]): Only list orders for a specific product
+            after (Optional[str]): Return the page after this cursor, taken
+                from the CB-AFTER header of the previous page
+            limit (Optional[int]): Number of orders per page (max 100)
         Returns:
             list: Information about all your current open orders. Example
                 response::
@@ -421,10 +501,45 @@ class PrivateClient(PublicClient):
             params["product_id"] = product_id
         if status:
             params["status"] = status
-        # TODO: paginate
-        r = requests.get(url, auth=self.auth, params=params, timeout=self.timeout)
+        if after is not None:
+            params["after"] = after
+        if limit is not None:
+            params["limit"] = limit
+        r = self.session.get(url, auth=self.auth, params=params,
+                             timeout=self.timeout)
         return r.json()
 
+    def iter_orders(self, product_id=None, status=[], limit=100):
+        """Page through your orders, newest first, following the CB-AFTER
+        cursor of each page.
+        Args:
+            product_id (Optional[str]): Only list orders for a specific product
+            status (Optional[list]): Limit list of orders to these statuses
+            limit (Optional[int]): Number of orders per page (max 100)
+        Returns:
+            generator: Pages of orders as returned by list_orders. An error
+                response is yielded as is and ends the iteration.
+        """
+        params = {"limit": limit}
+        if product_id is not None:
+            params["product_id"] = product_id
+        if status:
+            params["status"] = status
+        return self._pages('/orders', params)
+
+    def _pages(self, path, params):
+        params = dict((k, v) for k, v in params.items() if v is not None)
+        while True:
+            r = self.session.get(self.url + path, auth=self.auth,
+                                 params=params, timeout=self.timeout)
+            page = r.json()
+            yield page
+            after = r.headers.get('CB-AFTER')
+            if (not isinstance(page, list) or after is None or
+                    len(page) < (params.get("limit") or 100)):
+                return
+            params["after"] = after
+
     def get_order(self, order_id):
         """Get a single order by order ID.
         Args:
@@ -451,6 +566,6 @@ class PrivateClient(PublicClient):
                     "settled": true
                 }
         """
-        r = requests.get(self.url + '/orders/' + order_id, auth=self.auth,
-                         timeout=self.timeout)
+        r = self.session.get(self.url + '/orders/' + order_id,
+                             auth=self.auth, timeout=self.timeout)
         return r.json()
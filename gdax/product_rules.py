@@ -0,0 +1,187 @@
+from decimal import Decimal, ROUND_DOWN, ROUND_UP
+
+# Size precision used when a product does not specify base_increment.
+DEFAULT_BASE_INCREMENT = "0.00000001"
+
+
+class OrderValidationError(ValueError):
+    """Raised when an order violates the trading rules of its product."""
+
+
+def _s(value):
+    return format(value, "f")
+
+
+def _decimal(value):
+    # str() first so floats round trip through their shortest repr instead of
+    # their binary expansion.
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class _Rules(object):
+
+    def __init__(self, product):
+        self.product_id = product["id"]
+        self.quote_increment = Decimal(product["quote_increment"])
+        self.base_increment = Decimal(product.get("base_increment") or
+                                      DEFAULT_BASE_INCREMENT)
+        self.base_min_size = Decimal(product["base_min_size"])
+        self.base_max_size = Decimal(product["base_max_size"])
+        self.min_market_funds = (Decimal(product["min_market_funds"])
+                                 if product.get("min_market_funds") else None)
+        self.max_market_funds = (Decimal(product["max_market_funds"])
+                                 if product.get("max_market_funds") else None)
+
+    def price(self, price, side, type="limit"):
+        price = _decimal(price)
+        # Round so the order is never more aggressive than requested: limit
+        # prices away from the other side of the book, stop prices away from
+        # the market so they do not trigger early.
+        if type == "stop":
+            rounding = ROUND_UP if side == "buy" else ROUND_DOWN
+        else:
+            rounding = ROUND_DOWN if side == "buy" else ROUND_UP
+        price = (price / self.quote_increment).to_integral_value(
+            rounding) * self.quote_increment
+        if price <= 0:
+            raise OrderValidationError("{}: price {} is below quote_increment "
+                                       "{}".format(self.product_id, price,
+                                                   self.quote_increment))
+        return price
+
+    def size(self, size):
+        size = (_decimal(size) / self.base_increment).to_integral_value(
+            ROUND_DOWN) * self.base_increment
+        if size < self.base_min_size:
+            raise OrderValidationError("{}: size {} is below base_min_size "
+                                       "{}".format(self.product_id, size,
+                                                   self.base_min_size))
+        if size > self.base_max_size:
+            raise OrderValidationError("{}: size {} is above base_max_size "
+                                       "{}".format(self.product_id, size,
+                                                   self.base_max_size))
+        return size
+
+    def funds(self, funds):
+        funds = (_decimal(funds) / self.quote_increment).to_integral_value(
+            ROUND_DOWN) * self.quote_increment
+        if funds <= 0 or (self.min_market_funds is not None and
+                          funds < self.min_market_funds):
+            raise OrderValidationError("{}: funds {} are below the minimum"
+                                       .format(self.product_id, funds))
+        if self.max_market_funds is not None and funds > self.max_market_funds:
+            raise OrderValidationError("{}: funds {} are above "
+                                       "max_market_funds {}"
+                                       .format(self.product_id, funds,
+                                               self.max_market_funds))
+        return funds
+
+
+class ProductRules(object):
+    """Trading rules of each product, used to check and round orders locally
+    before they are sent.
+
+    Prices are rounded to quote_increment (limit buys down and sells up, stop
+    buys up and sells down), sizes down to base_increment and funds down to
+    quote_increment, using Decimal arithmetic. Orders outside
+    base_min_size/base_max_size raise OrderValidationError instead of being
+    rejected by the API.
+    """
+
+    def __init__(self, products):
+        """Create product rules.
+        Args:
+            products (list): Products as returned by `get_products`
+        """
+        self._rules = {}
+        for product in products:
+            self._rules[product["id"]] = _Rules(product)
+
+    @classmethod
+    def from_client(cls, client):
+        """Load product rules with a single call to `get_products`.
+        Args:
+            client (PublicClient): Client to load products from
+        Returns:
+            ProductRules: Rules for all products
+        """
+        return cls(client.get_products())
+
+    def __contains__(self, product_id):
+        return product_id in self._rules
+
+    def _get(self, product_id):
+        try:
+            return self._rules[product_id]
+        except KeyError:
+            raise OrderValidationError("unknown product {}".format(product_id))
+
+    def normalize(self, product_id, side, price=None, size=None, funds=None,
+                  type="limit"):
+        """Check and round the price, size and funds of an order.
+        Args:
+            product_id (str): ID of the product
+            side (str): buy or sell
+            price (Optional[str]): Price of the order
+            size (Optional[str]): Amount of product to order
+            funds (Optional[str]): Amount of quote currency to use
+            type (Optional[str]): limit, market or stop
+        Returns:
+            dict: The price, size and funds given, rounded and as strings
+        Raises:
+            OrderValidationError: If the order violates the product rules
+        """
+        rules = self._get(product_id)
+        result = {}
+        if price is not None:
+            result["price"] = _s(rules.price(price, side, type))
+        if size is not None:
+            result["size"] = _s(rules.size(size))
+        if funds is not None:
+            result["funds"] = _s(rules.funds(funds))
+        return result
+
+    def normalize_order(self, order):
+        """Check and round the parameters of an order before it is placed.
+        Args:
+            order (dict): Order parameters as sent to `/orders`
+        Returns:
+            dict: A copy of the parameters with price, size and funds rounded
+        Raises:
+            OrderValidationError: If the order violates the product rules
+        """
+        normalized = dict(order)
+        normalized.update(self.normalize(order["product_id"], order["side"],
+                                         order.get("price"),
+                                         order.get("size"),
+                                         order.get("funds"),
+                                         order.get("type", "limit")))
+        return normalized
+
+    def normalize_ladder(self, product_id, side, prices, sizes):
+        """Check and round a ladder of limit orders in one pass.
+        Args:
+            product_id (str): ID of the product
+            side (str): buy or sell
+            prices (list): Price of each order
+            sizes (list): Size of each order, or a single size for all
+        Returns:
+            list: (price, size) string pairs, one per order
+        Raises:
+            OrderValidationError: If any order violates the product rules.
+                The message gives the index of the first offending order.
+        """
+        rules = self._get(product_id)
+        if isinstance(sizes, (str, int, float, Decimal)):
+            sizes = [sizes] * len(prices)
+        if len(sizes) != len(prices):
+            raise OrderValidationError("got {} prices and {} sizes".format(
+                len(prices), len(sizes)))
+        ladder = []
+        for i, (price, size) in enumerate(zip(prices, sizes)):
+            try:
+                ladder.append((_s(rules.price(price, side)),
+                               _s(rules.size(size))))
+            except OrderValidationError as e:
+                raise OrderValidationError("order {}: {}".format(i, e))
+        return ladder
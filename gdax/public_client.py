@@ -23,13 +23,19 @@ class PublicClient(object):
     LTC_EUR = "LTC-EUR"
     LTC_USD = "LTC-USD"
 
-    def __init__(self, api_url='https://api.gdax.com', timeout=30):
+    def __init__(self, api_url='https://api.gdax.com', timeout=30,
+                 session=None):
         """Create GDAX API public client.
         Args:
             api_url (Optional[str]): API URL.
+            timeout (Optional[float]): Request timeout in seconds.
+            session (Optional[object]): Transport with requests-style get,
+                post and delete methods, e.g. a requests.Session or a
+                SimulatedExchange. Defaults to the requests module.
         """
         self.url = api_url.rstrip('/')
         self.timeout = timeout
+        self.session = session if session is not None else requests
 
     def _get(self, path, params=None):
         """Perform a get request
@@ -39,7 +45,8 @@ class PublicClient(object):
         Returns:
             dictionary: Output from the get request
         """
-        r = requests.get(self.url + path, params=params, timeout=self.timeout)
+        r = self.session.get(self.url + path, params=params,
+                             timeout=self.timeout)
         return r.json()
 
     def get_products(self):
@@ -106,10 +113,13 @@ class PublicClient(object):
         """
         return self._get('/products/{}/ticker'.format(str(product_id)))
 
-    def get_trades(self, product_id):
+    def get_trades(self, product_id, before=None, after=None, limit=None):
         """List the latest trades for a product
         Args:
             product_id (str): ID of the product
+            before (Optional[int]): Return trades newer than this trade ID
+            after (Optional[int]): Return trades older than this trade ID
+            limit (Optional[int]): Number of trades per page (max 100)
         Returns:
             list: A list of latest trades. Example response::
                 [{
@@ -126,7 +136,15 @@ class PublicClient(object):
                     "side": "sell"
                 }]
         """
-        return self._get('/products/{}/trades'.format(str(product_id)))
+        params = {}
+        if before is not None:
+            params['before'] = before
+        if after is not None:
+            params['after'] = after
+        if limit is not None:
+            params['limit'] = limit
+        return self._get('/products/{}/trades'.format(str(product_id)),
+                         params=params)
 
     def get_historic_rates(self, product_id, start=None, end=None,
                            granularity=None):
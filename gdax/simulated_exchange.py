@@ -0,0 +1,737 @@
+import bisect
+import itertools
+import json
+import time
+from collections import deque
+from decimal import Decimal, ROUND_DOWN
+
+from gdax.public_client import PublicClient
+
+try:
+    from urllib.parse import parse_qsl
+except ImportError:  # Python 2
+    from urlparse import parse_qsl
+
+ZERO = Decimal("0")
+ONE = Decimal("1")
+SIZE_STEP = Decimal("0.00000001")
+FEE_STEP = Decimal("0.0000000000000001")
+OPEN_STATUSES = ("open", "pending", "active")
+
+
+def _s(value):
+    return format(value, "f")
+
+
+def _iso(t):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + \
+        ".{:06d}Z".format(int((t % 1) * 1000000))
+
+
+def _default_products():
+    products = []
+    for name in sorted(set(v for k, v in vars(PublicClient).items()
+                           if k.isupper())):
+        base, quote = name.split("-")
+        products.append({
+            "id": name,
+            "base_currency": base,
+            "quote_currency": quote,
+            "base_min_size": "0.01",
+            "base_max_size": "10000.00",
+            "quote_increment": "0.00001" if quote == "BTC" else "0.01",
+        })
+    return products
+
+
+class SimulatedResponse(object):
+    """Response returned by SimulatedExchange, with the parts of the
+    requests.Response interface used by the clients.
+    """
+
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return self.body
+
+
+class _Order(object):
+    __slots__ = ("id", "client_oid", "product_id", "side", "type", "price",
+                 "size", "funds", "remaining", "remaining_funds",
+                 "filled_size", "executed_value", "fill_fees", "status",
+                 "done_reason", "post_only", "time_in_force", "created_at",
+                 "done_at", "owned", "hold", "stop_price", "seq")
+
+    def __init__(self, **kwargs):
+        self.client_oid = self.price = self.size = self.funds = None
+        self.remaining = self.remaining_funds = self.stop_price = None
+        self.done_reason = self.done_at = self.time_in_force = None
+        self.filled_size = self.executed_value = self.fill_fees = ZERO
+        self.hold = ZERO
+        self.post_only = False
+        self.owned = True
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def json(self):
+        order = {
+            "id": self.id,
+            "product_id": self.product_id,
+            "side": self.side,
+            "stp": "dc",
+            "type": self.type,
+            "post_only": self.post_only,
+            "created_at": _iso(self.created_at),
+            "fill_fees": _s(self.fill_fees),
+            "filled_size": _s(self.filled_size),
+            "executed_value": _s(self.executed_value),
+            "status": self.status,
+            "settled": self.status == "done",
+        }
+        if self.price is not None:
+            order["price"] = _s(self.price)
+        if self.size is not None:
+            order["size"] = _s(self.size)
+        if self.funds is not None:
+            order["specified_funds"] = _s(self.funds)
+        if self.stop_price is not None:
+            order["stop_price"] = _s(self.stop_price)
+        if self.time_in_force is not None:
+            order["time_in_force"] = self.time_in_force
+        if self.client_oid is not None:
+            order["client_oid"] = self.client_oid
+        if self.done_at is not None:
+            order["done_at"] = _iso(self.done_at)
+            order["done_reason"] = self.done_reason
+        return order
+
+
+class _BookSide(object):
+    """Price levels of one side of a book. Keys are kept in ascending order
+    with the best price last: the price for bids and its negation for asks.
+    """
+
+    def __init__(self, sign):
+        self.sign = sign
+        self.keys = []
+        self.levels = {}
+
+    def best(self):
+        if not self.keys:
+            return None
+        return self.keys[-1] * self.sign
+
+    def add(self, order):
+        key = order.price * self.sign
+        level = self.levels.get(key)
+        if level is None:
+            level = self.levels[key] = deque()
+            bisect.insort(self.keys, key)
+        level.append(order)
+
+    def remove(self, order):
+        key = order.price * self.sign
+        level = self.levels[key]
+        level.remove(order)
+        if not level:
+            del self.levels[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def snapshot(self, level, depth):
+        rows = []
+        for key in reversed(self.keys[-depth:] if depth else self.keys):
+            price = _s(key * self.sign)
+            orders = self.levels[key]
+            if level == 3:
+                rows.extend([price, _s(o.remaining), o.id] for o in orders)
+            else:
+                rows.append([price, _s(sum(o.remaining for o in orders)),
+                             len(orders)])
+        return rows
+
+
+class _Book(object):
+
+    def __init__(self, product):
+        self.product = product
+        self.base = product["base_currency"]
+        self.quote = product["quote_currency"]
+        self.base_min_size = Decimal(product["base_min_size"])
+        self.base_max_size = Decimal(product["base_max_size"])
+        self.bids = _BookSide(1)
+        self.asks = _BookSide(-1)
+        self.stops = []
+        self.trades = deque(maxlen=1000)
+        self.trade_ids = itertools.count(1)
+        self.sequence = 0
+
+
+class SimulatedExchange(object):
+    """In-memory exchange that can be used as the session of a PublicClient
+    or PrivateClient, so strategy code runs unchanged without a network.
+
+    Each product has a price-time priority book matched in process. Orders
+    placed through the clients hold funds in the simulated accounts and
+    trade against each other and against liquidity seeded with `load_book`.
+    Supported endpoints are `/orders` (place, list, get and cancel),
+    `/accounts` with their ledger and holds, and `/products` with their
+    book, ticker and trades. GTT orders are treated as GTC and the
+    self-trade prevention flag is ignored.
+    """
+
+    def __init__(self, products=None, maker_fee="0", taker_fee="0",
+                 clock=time.time):
+        """Create a simulated exchange.
+        Args:
+            products (Optional[list]): Products in the format returned by
+                `get_products`. Defaults to the products listed on
+                PublicClient.
+            maker_fee (Optional[str]): Fee rate charged to resting orders
+            taker_fee (Optional[str]): Fee rate charged to incoming orders
+            clock (Optional[callable]): Returns the current time in seconds
+        """
+        self.maker_fee = Decimal(maker_fee)
+        self.taker_fee = Decimal(taker_fee)
+        self.clock = clock
+        self.books = {}
+        self.orders = {}
+        self.accounts = {}
+        self.ledger = {}
+        self._ledger_keys = {}
+        self._order_ids = itertools.count(1)
+        self._ledger_ids = itertools.count(1)
+        self._accounts_by_id = {}
+        # Orders placed through the clients, in placement order, and the ones
+        # still open for each product, so listings do not scan every order.
+        self._owned = []
+        self._owned_seqs = []
+        self._open = {}
+        for product in products or _default_products():
+            self.add_product(product)
+
+    def add_product(self, product):
+        """Add a product and accounts for its currencies.
+        Args:
+            product (dict): Product in the format returned by `get_products`
+        """
+        book = self.books[product["id"]] = _Book(product)
+        self._open[product["id"]] = {}
+        for currency in (book.base, book.quote):
+            if currency not in self.accounts:
+                account_id = "{:08d}-0000-0000-0000-{:012d}".format(
+                    len(self.accounts) + 1, 0)
+                account = {"id": account_id, "currency": currency,
+                           "balance": ZERO, "hold": ZERO}
+                self.accounts[currency] = account
+                self._accounts_by_id[account_id] = account
+                self.ledger[account_id] = []
+                self._ledger_keys[account_id] = []
+
+    def deposit(self, currency, amount):
+        """Credit an account.
+        Args:
+            currency (str): Currency of the account
+            amount (str): Amount to credit
+        """
+        amount = Decimal(str(amount))
+        self._credit(self.accounts[currency], amount, "transfer", {})
+
+    def load_book(self, product_id, book):
+        """Seed a book with resting liquidity from a recorded snapshot. The
+        seeded orders belong to no account.
+        Args:
+            product_id (str): ID of the product
+            book (dict): Result of `get_product_order_book` at level 2 or 3.
+                At level 2 each price level becomes a single order.
+        """
+        target = self.books[product_id]
+        target.sequence = int(book.get("sequence", target.sequence))
+        for side, rows in (("buy", book.get("bids", [])),
+                           ("sell", book.get("asks", []))):
+            book_side = target.bids if side == "buy" else target.asks
+            for row in rows:
+                size = Decimal(str(row[1]))
+                seq = next(self._order_ids)
+                order = _Order(id=self._order_id(seq), seq=seq,
+                               product_id=product_id, side=side, type="limit",
+                               price=Decimal(str(row[0])), size=size,
+                               remaining=size, status="open", owned=False,
+                               created_at=self.clock())
+                self.orders[order.id] = order
+                book_side.add(order)
+
+    # Transport
+
+    def get(self, url, params=None, **kwargs):
+        path, query = self._split(url, params)
+        parts = path.strip("/").split("/")
+        if parts[0] == "orders":
+            if len(parts) == 1:
+                return self._list_orders(query)
+            order = self.orders.get(parts[1])
+            if order is None or not order.owned:
+                return SimulatedResponse({"message": "NotFound"}, 404)
+            return SimulatedResponse(order.json())
+        if parts[0] == "accounts":
+            return self._get_accounts(parts[1:], query)
+        if parts[0] == "products":
+            return self._get_products(parts[1:], query)
+        if parts[0] == "time":
+            now = self.clock()
+            return SimulatedResponse({"iso": _iso(now), "epoch": now})
+        return SimulatedResponse({"message": "NotFound"}, 404)
+
+    def post(self, url, data=None, **kwargs):
+        path, _ = self._split(url, None)
+        if path.rstrip("/") != "/orders":
+            return SimulatedResponse({"message": "NotFound"}, 404)
+        return self.place(json.loads(data))
+
+    def delete(self, url, params=None, **kwargs):
+        path, query = self._split(url, params)
+        parts = path.strip("/").split("/")
+        if parts[0] != "orders":
+            return SimulatedResponse({"message": "NotFound"}, 404)
+        if len(parts) > 1 and parts[1]:
+            order = self.orders.get(parts[1])
+            if (order is None or not order.owned or
+                    order.status not in OPEN_STATUSES):
+                return SimulatedResponse({"message": "order not found"}, 404)
+            self._cancel(order)
+            return SimulatedResponse(order.id)
+        product_id = query.get("product_id")
+        canceled = []
+        for order in self._open_orders(product_id):
+            self._cancel(order)
+            canceled.append(order.id)
+        return SimulatedResponse(canceled)
+
+    @staticmethod
+    def _split(url, params):
+        path = url.split("://", 1)[-1]
+        path = path[path.find("/"):] if "/" in path else "/"
+        query = {}
+        if "?" in path:
+            path, qs = path.split("?", 1)
+            query.update(parse_qsl(qs))
+        if params:
+            query.update(params)
+        return path, query
+
+    # Orders
+
+    def place(self, params):
+        """Place an order, as if posted to `/orders`.
+        Args:
+            params (dict): Order parameters
+        Returns:
+            SimulatedResponse: The order, or an error message
+        """
+        book = self.books.get(params.get("product_id"))
+        if book is None:
+            return SimulatedResponse({"message": "Invalid product_id"}, 400)
+        side = params.get("side")
+        kind = params.get("type", "limit")
+        if side not in ("buy", "sell") or kind not in ("limit", "market",
+                                                       "stop"):
+            return SimulatedResponse({"message": "Invalid order"}, 400)
+
+        order = _Order(product_id=book.product["id"], side=side, type=kind,
+                       status="pending", client_oid=params.get("client_oid"),
+                       created_at=self.clock())
+        try:
+            error = self._parse(book, order, params)
+        except (ArithmeticError, ValueError, TypeError):
+            error = "Invalid order"
+        if error is not None:
+            return SimulatedResponse({"message": error}, 400)
+
+        if side == "buy":
+            account = self.accounts[book.quote]
+            if order.funds is not None:
+                hold = order.funds
+            elif kind == "limit":
+                hold = order.price * order.size * (ONE + self.taker_fee)
+            elif kind == "stop":
+                hold = order.stop_price * order.size * (ONE + self.taker_fee)
+            else:
+                hold = account["balance"] - account["hold"]
+        else:
+            account = self.accounts[book.base]
+            if order.size is not None:
+                hold = order.size
+            else:
+                hold = account["balance"] - account["hold"]
+        if hold > account["balance"] - account["hold"] or hold <= 0:
+            return SimulatedResponse({"message": "Insufficient funds"}, 400)
+        order.hold = hold
+        account["hold"] += hold
+        order.seq = next(self._order_ids)
+        order.id = self._order_id(order.seq)
+        self.orders[order.id] = order
+        self._owned.append(order)
+        self._owned_seqs.append(order.seq)
+        self._open[order.product_id][order.id] = order
+
+        if kind == "stop":
+            book.stops.append(order)
+            return SimulatedResponse(order.json())
+        self._execute(book, order)
+        return SimulatedResponse(order.json())
+
+    def _execute(self, book, order):
+        if order.type == "limit":
+            opposite = book.asks if order.side == "buy" else book.bids
+            best = opposite.best()
+            crosses = best is not None and (
+                best <= order.price if order.side == "buy"
+                else best >= order.price)
+            if order.post_only and crosses:
+                order.status = "rejected"
+                self._done(book, order, "rejected")
+                return
+            if (order.time_in_force == "FOK" and
+                    self._liquidity(opposite, order) < order.size):
+                self._done(book, order, "canceled")
+                return
+
+        low, high, starved = self._match(book, order)
+        if order.type == "limit" and order.remaining > 0:
+            if order.time_in_force in ("IOC", "FOK"):
+                self._done(book, order, "canceled")
+            else:
+                order.status = "open"
+                (book.bids if order.side == "buy" else book.asks).add(order)
+        elif order.remaining is not None:
+            # Market orders the book or the hold could not fill are canceled.
+            self._done(book, order,
+                       "filled" if order.remaining == 0 else "canceled")
+        else:
+            self._done(book, order, "canceled" if starved else "filled")
+        if high is not None:
+            self._trigger_stops(book, low, high)
+
+    def _liquidity(self, side, order):
+        total = ZERO
+        for key in reversed(side.keys):
+            price = key * side.sign
+            if (price > order.price if order.side == "buy"
+                    else price < order.price):
+                break
+            total += sum(o.remaining for o in side.levels[key])
+            if total >= order.size:
+                break
+        return total
+
+    def _match(self, book, taker):
+        opposite = book.asks if taker.side == "buy" else book.bids
+        low = high = None
+        starved = False
+        while True:
+            if not opposite.keys:
+                starved = True
+                break
+            key = opposite.keys[-1]
+            price = key * opposite.sign
+            if taker.price is not None and (
+                    price > taker.price if taker.side == "buy"
+                    else price < taker.price):
+                break
+            level = opposite.levels[key]
+            maker = level[0]
+            size = maker.remaining
+            if taker.remaining is not None:
+                size = min(size, taker.remaining)
+            if taker.side == "buy" and taker.type != "limit":
+                # Market buys are bounded by the funds left on hold.
+                affordable = (taker.hold / (price * (ONE + self.taker_fee))
+                              ).quantize(SIZE_STEP, ROUND_DOWN)
+                size = min(size, affordable)
+            if taker.remaining_funds is not None:
+                # Market sells by funds stop once the funds are reached.
+                size = min(size, (taker.remaining_funds / price).quantize(
+                    SIZE_STEP, ROUND_DOWN))
+            if taker.side == "sell" and taker.hold < size:
+                # Sells are bounded by the size left on hold; running out
+                # ends the order before its funds are reached.
+                size = taker.hold
+                starved = True
+            if size <= 0:
+                break
+
+            trade_id = next(book.trade_ids)
+            self._fill(book, maker, price, size, self.maker_fee, trade_id)
+            self._fill(book, taker, price, size, self.taker_fee, trade_id)
+            book.trades.appendleft({
+                "time": _iso(self.clock()),
+                "trade_id": trade_id,
+                "price": _s(price),
+                "size": _s(size),
+                "side": maker.side,
+            })
+            low = price if low is None else min(low, price)
+            high = price if high is None else max(high, price)
+
+            if maker.remaining == 0:
+                level.popleft()
+                if not level:
+                    del opposite.levels[key]
+                    opposite.keys.pop()
+                self._done(book, maker, "filled")
+            if taker.remaining is not None and taker.remaining == 0:
+                break
+        return low, high, starved
+
+    def _fill(self, book, order, price, size, fee_rate, trade_id):
+        book.sequence += 1
+        value = price * size
+        fee = ZERO
+        if fee_rate:
+            fee = (value * fee_rate).quantize(FEE_STEP)
+        if order.remaining is not None:
+            order.remaining -= size
+        order.filled_size += size
+        order.executed_value += value
+        if order.remaining_funds is not None:
+            order.remaining_funds -= value
+        order.fill_fees += fee
+        if order.status == "pending":
+            order.status = "active" if order.type != "limit" else "open"
+        if not order.owned:
+            return
+
+        base = self.accounts[book.base]
+        quote = self.accounts[book.quote]
+        details = {"order_id": order.id, "trade_id": str(trade_id),
+                   "product_id": book.product["id"]}
+        if order.side == "buy":
+            if order.type == "limit":
+                release = size * order.price * (ONE + self.taker_fee)
+            else:
+                release = value + fee
+            release = min(release, order.hold)
+            order.hold -= release
+            quote["hold"] -= release
+            self._credit(quote, -value, "match", details)
+            self._credit(base, size, "match", details)
+        else:
+            order.hold -= size
+            base["hold"] -= size
+            self._credit(base, -size, "match", details)
+            self._credit(quote, value, "match", details)
+        if fee:
+            self._credit(quote, -fee, "fee", details)
+
+    def _trigger_stops(self, book, low, high):
+        triggered = [o for o in book.stops
+                     if (o.side == "buy" and high >= o.stop_price) or
+                     (o.side == "sell" and low <= o.stop_price)]
+        for order in triggered:
+            book.stops.remove(order)
+        for order in triggered:
+            order.status = "active"
+            self._execute(book, order)
+
+    def _cancel(self, order):
+        book = self.books[order.product_id]
+        if order.stop_price is not None and order in book.stops:
+            book.stops.remove(order)
+        elif order.status == "open":
+            (book.bids if order.side == "buy" else book.asks).remove(order)
+        self._done(book, order, "canceled")
+
+    def _done(self, book, order, reason):
+        if order.hold:
+            currency = book.quote if order.side == "buy" else book.base
+            self.accounts[currency]["hold"] -= order.hold
+            order.hold = ZERO
+        if order.status != "rejected":
+            order.status = "done"
+        order.done_reason = reason
+        order.done_at = self.clock()
+        if order.owned:
+            self._open[order.product_id].pop(order.id, None)
+
+    def _parse(self, book, order, params):
+        side, kind = order.side, order.type
+        if "size" in params:
+            order.size = order.remaining = Decimal(str(params["size"]))
+            if not book.base_min_size <= order.size <= book.base_max_size:
+                return "size must be between {} and {}".format(
+                    _s(book.base_min_size), _s(book.base_max_size))
+        elif "funds" in params and kind != "limit":
+            order.funds = Decimal(str(params["funds"]))
+            if order.funds <= 0:
+                return "funds must be positive"
+            if side == "sell":
+                order.remaining_funds = order.funds
+        else:
+            return "size is required"
+        if kind == "limit":
+            if "price" not in params:
+                return "price is required"
+            order.price = Decimal(str(params["price"]))
+            order.time_in_force = params.get("time_in_force", "GTC")
+            order.post_only = str(params.get("post_only")).lower() == "true"
+        elif kind == "stop":
+            if "price" not in params:
+                return "price is required"
+            order.stop_price = Decimal(str(params["price"]))
+        if order.price is not None and order.price <= 0 or \
+                order.stop_price is not None and order.stop_price <= 0:
+            return "price must be positive"
+        return None
+
+    @staticmethod
+    def _order_id(seq):
+        return "00000000-0000-0000-0000-{:012d}".format(seq)
+
+    def _open_orders(self, product_id=None):
+        if product_id is not None:
+            return list(self._open.get(product_id, {}).values())
+        return [o for orders in self._open.values() for o in orders.values()]
+
+    def _list_orders(self, query):
+        statuses = query.get("status") or OPEN_STATUSES
+        if isinstance(statuses, str):
+            statuses = [statuses]
+        product_id = query.get("product_id")
+        limit = int(query.get("limit", 100))
+        after = int(query["after"]) if "after" in query else None
+        orders = []
+        if "all" in statuses:
+            end = len(self._owned_seqs)
+            if after is not None:
+                end = bisect.bisect_left(self._owned_seqs, after)
+            for i in range(end - 1, -1, -1):
+                order = self._owned[i]
+                if product_id is None or order.product_id == product_id:
+                    orders.append(order)
+                    if len(orders) == limit:
+                        break
+        else:
+            orders = sorted((o for o in self._open_orders(product_id)
+                             if o.status in statuses and
+                             (after is None or o.seq < after)),
+                            key=lambda o: o.seq, reverse=True)[:limit]
+        return self._page([o.json() for o in orders],
+                          orders[-1].seq if orders else None)
+
+    @staticmethod
+    def _page(items, after):
+        response = SimulatedResponse(items)
+        if after is not None:
+            response.headers["CB-AFTER"] = str(after)
+        return response
+
+    # Accounts
+
+    def _credit(self, account, amount, kind, details):
+        account["balance"] += amount
+        entry_id = next(self._ledger_ids)
+        self._ledger_keys[account["id"]].append(entry_id)
+        self.ledger[account["id"]].append({
+            "id": str(entry_id),
+            "created_at": _iso(self.clock()),
+            "amount": _s(amount),
+            "balance": _s(account["balance"]),
+            "type": kind,
+            "details": details,
+        })
+
+    @staticmethod
+    def _account_json(account):
+        return {
+            "id": account["id"],
+            "currency": account["currency"],
+            "balance": _s(account["balance"]),
+            "available": _s(account["balance"] - account["hold"]),
+            "hold": _s(account["hold"]),
+            "profile_id": "00000000-0000-0000-0000-000000000000",
+        }
+
+    def _get_accounts(self, parts, query):
+        if not parts:
+            return SimulatedResponse([self._account_json(a)
+                                      for a in self.accounts.values()])
+        account = self._accounts_by_id.get(parts[0])
+        if account is None:
+            return SimulatedResponse({"message": "NotFound"}, 404)
+        if len(parts) == 1:
+            return SimulatedResponse(self._account_json(account))
+        if parts[1] == "ledger":
+            entries = self.ledger[account["id"]]
+            keys = self._ledger_keys[account["id"]]
+            limit = int(query.get("limit", 100))
+            if "before" in query:
+                start = bisect.bisect_right(keys, int(query["before"]))
+                page = entries[start:start + limit]
+            else:
+                end = len(keys)
+                if "after" in query:
+                    end = bisect.bisect_left(keys, int(query["after"]))
+                page = entries[max(0, end - limit):end]
+            return self._page(list(reversed(page)),
+                              page[0]["id"] if page else None)
+        if parts[1] == "holds":
+            limit = int(query.get("limit", 100))
+            after = int(query["after"]) if "after" in query else None
+            orders = sorted((o for o in self._open_orders()
+                             if o.hold and (after is None or o.seq < after)
+                             and self.accounts[
+                                 self.books[o.product_id].quote
+                                 if o.side == "buy"
+                                 else self.books[o.product_id].base]
+                             is account),
+                            key=lambda o: o.seq, reverse=True)[:limit]
+            holds = [{"id": o.id, "account_id": account["id"],
+                      "created_at": _iso(o.created_at),
+                      "amount": _s(o.hold), "type": "order", "ref": o.id}
+                     for o in orders]
+            return self._page(holds, orders[-1].seq if orders else None)
+        return SimulatedResponse({"message": "NotFound"}, 404)
+
+    # Products
+
+    def _get_products(self, parts, query):
+        if not parts:
+            return SimulatedResponse([b.product for b in self.books.values()])
+        book = self.books.get(parts[0])
+        if book is None:
+            return SimulatedResponse({"message": "NotFound"}, 404)
+        endpoint = parts[1] if len(parts) > 1 else None
+        if endpoint == "book":
+            level = int(query.get("level", 1))
+            depth = {1: 1, 2: 50}.get(level, 0)
+            return SimulatedResponse({
+                "sequence": book.sequence,
+                "bids": book.bids.snapshot(level, depth),
+                "asks": book.asks.snapshot(level, depth),
+            })
+        if endpoint == "ticker":
+            last = book.trades[0] if book.trades else {}
+            bid, ask = book.bids.best(), book.asks.best()
+            return SimulatedResponse({
+                "trade_id": last.get("trade_id"),
+                "price": last.get("price"),
+                "size": last.get("size"),
+                "bid": _s(bid) if bid is not None else None,
+                "ask": _s(ask) if ask is not None else None,
+                "time": last.get("time"),
+            })
+        if endpoint == "trades":
+            trades = book.trades
+            if "before" in query:
+                trades = [t for t in trades
+                          if t["trade_id"] > int(query["before"])]
+                trades = trades[-int(query.get("limit", 100)):]
+            else:
+                if "after" in query:
+                    trades = [t for t in trades
+                              if t["trade_id"] < int(query["after"])]
+                trades = list(trades)[:int(query.get("limit", 100))]
+            return SimulatedResponse(trades)
+        return SimulatedResponse({"message": "NotFound"}, 404)
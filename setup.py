@@ -18,5 +18,9 @@ setup(
 	license='MIT',
 	keywords='gdax',
 	packages=find_packages(exclude=['tests']),
-	install_requires=['requests']
+	install_requires=['requests'],
+	extras_require={
+		'analytics': ['numpy'],
+		'parquet': ['pyarrow'],
+	}
 	)
\ No newline at end of file
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+import gdax
+
+
+def make_cache(fee="0.003"):
+    exchange = gdax.SimulatedExchange(maker_fee=fee, taker_fee=fee)
+    exchange.deposit("USD", 10000)
+    exchange.deposit("ETH", 10)
+    client = gdax.PrivateClient("", "", "", session=exchange)
+    cache = gdax.AccountCache(client, interval=3600, fee_rate=fee)
+    cache.resync()
+    return exchange, client, cache
+
+
+def exchange_account(client, currency):
+    for account in client.list_accounts():
+        if account["currency"] == currency:
+            return account
+
+
+def assert_matches(client, cache, currency):
+    account = exchange_account(client, currency)
+    assert cache.hold(currency) == Decimal(account["hold"])
+    assert cache.available(currency) == Decimal(account["available"])
+    assert cache.balance(currency) == Decimal(account["balance"])
+
+
+def test_limit_buy_hold_includes_fee():
+    exchange, client, cache = make_cache()
+    client.limit_buy(client.ETH_USD, price=1000, size=2)
+    assert not cache.stale
+    assert cache.hold("USD") == Decimal("2006")
+    assert_matches(client, cache, "USD")
+    assert not cache.can_afford("USD", 8000)
+
+
+def test_fills_and_cancels_are_projected():
+    exchange, client, cache = make_cache()
+    order = client.limit_buy(client.ETH_USD, price=1000, size=2)
+    exchange.place({"product_id": gdax.ETH_USD, "side": "sell",
+                    "type": "market", "size": "0.5"})
+    cache.update({"type": "match", "maker_order_id": order["id"],
+                  "size": "0.5", "price": "1000"})
+    assert not cache.stale
+    # Both sides of the trade are ours, so compare the order's own effect.
+    assert cache.hold("USD") == Decimal("1504.5")
+    assert cache.balance("ETH") == Decimal("10.5")
+
+    client.cancel_order(order["id"])
+    assert cache.hold("USD") == 0
+
+
+def test_sell_hold():
+    exchange, client, cache = make_cache()
+    client.limit_sell(client.ETH_USD, price=1000, size=4)
+    assert_matches(client, cache, "ETH")
+    assert cache.available("ETH") == 6
+
+
+def test_orders_done_on_arrival_trigger_resync():
+    exchange, client, cache = make_cache()
+    client.limit_buy(client.ETH_USD, price=1000, size=1)
+    client.market_sell(client.ETH_USD, size=1)
+    assert cache.stale
+    assert_matches(client, cache, "USD")
+    assert_matches(client, cache, "ETH")
+    assert not cache.stale
+
+
+def test_check_detects_discrepancy():
+    exchange, client, cache = make_cache()
+    account = exchange_account(client, "USD")
+    assert cache.check(account)
+    exchange.deposit("USD", 5)
+    assert not cache.check(client.get_account(account["id"]))
+    assert cache.stale
+
+
+def test_partial_fill_on_arrival_is_projected():
+    exchange, client, cache = make_cache()
+    exchange.load_book(gdax.ETH_USD, {"bids": [], "asks": [["100", "1", 1]]})
+    order = client.limit_buy(client.ETH_USD, price=100, size=2,
+                             post_only=None)
+    assert order["status"] == "open"
+    assert not cache.stale
+    assert cache.hold("USD") == Decimal("100.3")
+    assert cache.balance("USD") == Decimal("9899.7")
+    assert cache.balance("ETH") == 11
+    assert_matches(client, cache, "USD")
+    assert_matches(client, cache, "ETH")
+
+
+def test_resync_error_keeps_projection(monkeypatch):
+    exchange, client, cache = make_cache()
+    client.limit_buy(client.ETH_USD, price=1000, size=2)
+    monkeypatch.setattr(client, "list_accounts",
+                        lambda: {"message": "Rate limit exceeded"})
+    assert not cache.resync()
+    assert cache.stale
+    assert cache.hold("USD") == Decimal("2006")
+    assert cache.can_afford("USD", 7000)
+    monkeypatch.undo()
+    assert_matches(client, cache, "USD")
+    assert not cache.stale
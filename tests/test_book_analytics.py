@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+import gdax
+from gdax.book_analytics import batch
+
+np = pytest.importorskip("numpy")
+
+BOOK = {
+    "sequence": 1,
+    "bids": [["99", "1", 1], ["98", "2", 1]],
+    "asks": [["101", "1", 1], ["102", "2", 1]],
+}
+
+
+def close(actual, expected):
+    return np.allclose(actual, expected, equal_nan=True, rtol=1e-4)
+
+
+def test_mid_and_spread():
+    book = gdax.BookAnalytics(BOOK)
+    assert book.mid == 100
+    assert book.spread == 2
+    assert book.imbalance() == 0
+
+
+def test_vwap():
+    book = gdax.BookAnalytics(BOOK)
+    assert close(book.vwap("buy", [0.5, 1, 2, 3, 4]),
+                 [101, 101, 101.5, 101.6667, np.nan])
+    assert close(book.vwap("sell", 1.5), 98.6667)
+    assert close(book.slippage("buy", size=2), 150)
+    assert close(book.slippage("sell", size=1), 100)
+
+
+def test_price_for_funds():
+    book = gdax.BookAnalytics(BOOK)
+    assert close(book.price_for_funds("buy", [50, 101, 203, 305, 1000]),
+                 [101, 101, 101.5, 101.6667, np.nan])
+    assert close(book.slippage("buy", funds=101), 100)
+
+
+def test_depth():
+    book = gdax.BookAnalytics(BOOK)
+    bids, asks = book.depth([50, 100, 200, 300])
+    assert list(bids) == [0, 1, 3, 3]
+    assert list(asks) == [0, 1, 3, 3]
+    assert book.imbalance(100) == 0
+
+
+def test_empty_side():
+    book = gdax.BookAnalytics({"bids": [], "asks": BOOK["asks"]})
+    assert math.isnan(book.mid)
+    assert np.isnan(book.vwap("sell", [1, 2])).all()
+
+
+def test_batch():
+    results = batch({gdax.ETH_USD: BOOK,
+                     gdax.BTC_USD: gdax.BookAnalytics(BOOK)}, "buy",
+                    sizes=[1, 2])
+    for product_id in (gdax.ETH_USD, gdax.BTC_USD):
+        assert close(results[product_id]["price"], [101, 101.5])
+        assert close(results[product_id]["slippage"], [100, 150])
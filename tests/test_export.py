@@ -0,0 +1,112 @@
+import csv
+import json
+
+import pytest
+
+import gdax
+from gdax import export
+
+
+class Clock(object):
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_exchange(trades=0, clock=None):
+    exchange = gdax.SimulatedExchange(clock=clock or Clock(1500000000.5))
+    exchange.deposit("USD", 1000000)
+    exchange.deposit("ETH", 1000)
+    client = gdax.PrivateClient("", "", "", session=exchange)
+    for _ in range(trades):
+        client.limit_sell(client.ETH_USD, price=100, size=0.01)
+        client.market_buy(client.ETH_USD, size=0.01)
+    return exchange, client
+
+
+def test_parse_time():
+    assert export.parse_time("1500000000") == 1500000000
+    assert export.parse_time("2017-07-14") == 1499990400
+    assert export.parse_time("2017-07-14T02:40:00Z") == 1500000000
+    assert export.parse_time("2017-07-14T02:40:00.25Z") == 1500000000.25
+    with pytest.raises(ValueError):
+        export.parse_time("yesterday")
+
+
+def test_export_trades_pages_back_to_start():
+    clock = Clock(1500000000.5)
+    exchange, client = make_exchange(clock=clock)
+    for i in range(250):
+        # The first 50 trades land before the start, in the same second.
+        clock.now = 1500000000.25 if i < 50 else 1500000000.75
+        client.limit_sell(client.ETH_USD, price=100, size=0.01)
+        client.market_buy(client.ETH_USD, size=0.01)
+    public = gdax.PublicClient(session=exchange)
+
+    pages = list(export.export_trades(public, client.ETH_USD))
+    assert [len(page) for page in pages] == [100, 100, 50]
+    ids = [row["trade_id"] for page in pages for row in page]
+    assert ids == sorted(set(ids), reverse=True)
+
+    pages = list(export.export_trades(public, client.ETH_USD,
+                                      start="2017-07-14T02:40:00.5Z"))
+    assert sum(len(page) for page in pages) == 200
+    assert all(row["product_id"] == client.ETH_USD
+               for page in pages for row in page)
+
+
+def test_export_ledger_pages_through_history():
+    exchange, client = make_exchange()
+    account_id = exchange.accounts["USD"]["id"]
+    for _ in range(249):
+        exchange.deposit("USD", 1)
+    pages = list(export.export_ledger(client, account_id))
+    assert [len(page) for page in pages] == [100, 100, 50]
+    ids = [int(row["id"]) for page in pages for row in page]
+    assert ids == sorted(set(ids), reverse=True)
+    assert pages[0][0]["account_id"] == account_id
+
+
+def test_run_writes_each_target(tmpdir):
+    exchange, client = make_exchange(trades=120)
+    public = gdax.PublicClient(session=exchange)
+    out = str(tmpdir)
+
+    written = export.run("trades",
+                         lambda p: export.export_trades(public, p),
+                         [client.ETH_USD, client.BTC_USD], out, "csv")
+    path = tmpdir.join("trades-ETH-USD.csv")
+    assert written[str(path)] == 120
+    assert written[str(tmpdir.join("trades-BTC-USD.csv"))] == 0
+    with open(str(path)) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 120
+    assert list(rows[0]) == export.FIELDS["trades"]
+
+    export.run("trades", lambda p: export.export_trades(public, p),
+               [client.ETH_USD], out, "jsonl")
+    with open(str(tmpdir.join("trades-ETH-USD.jsonl"))) as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 120
+    assert rows[0]["price"] == "100"
+
+
+def test_parquet_schema_comes_from_fields(tmpdir):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+    path = str(tmpdir.join("book.parquet"))
+    writer = export.open_writer(path, export.FIELDS["book"], "parquet",
+                                chunk_size=1, types=export.TYPES["book"])
+    # The first chunk has no order_id and the second no num_orders.
+    writer.write([{"product_id": "ETH-USD", "sequence": 1, "price": "100",
+                   "size": "1", "num_orders": 2}])
+    writer.write([{"product_id": "ETH-USD", "sequence": 2, "price": "101",
+                   "size": "1", "order_id": "abc"}])
+    writer.close()
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 2
+    assert str(table.schema.field("sequence").type) == "int64"
+    assert str(table.schema.field("order_id").type) == "string"
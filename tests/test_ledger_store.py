@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import gdax
+
+
+def make_store(tmpdir):
+    exchange = gdax.SimulatedExchange()
+    exchange.deposit("USD", 0)
+    client = gdax.PrivateClient("", "", "", session=exchange)
+    store = gdax.LedgerStore(client, path=str(tmpdir.join("ledger.db")))
+    return exchange, client, store
+
+
+def test_sync_fetches_new_and_older_entries(tmpdir):
+    exchange, client, store = make_store(tmpdir)
+    account_id = exchange.accounts["USD"]["id"]
+    for _ in range(249):
+        exchange.deposit("USD", 1)
+    assert store.sync(account_id) == 250
+    assert store.checkpoint(account_id)["complete"]
+
+    for _ in range(150):
+        exchange.deposit("USD", 1)
+    assert store.sync(account_id) == 150
+    entries = store.entries(account_id)
+    assert len(entries) == 400
+    assert [int(e["id"]) for e in entries] == sorted(
+        int(e["id"]) for e in exchange.ledger[account_id])
+    assert store.totals(account_id)["transfer"] == Decimal(399)
+
+
+def test_sync_of_an_empty_account_backfills_later(tmpdir):
+    exchange, client, store = make_store(tmpdir)
+    account_id = exchange.accounts["BTC"]["id"]
+    assert store.sync(account_id) == 0
+    assert not store.checkpoint(account_id)["complete"]
+
+    for _ in range(250):
+        exchange.deposit("BTC", 1)
+    assert store.sync(account_id) == 250
+    assert len(store.entries(account_id)) == 250
+    assert store.checkpoint(account_id)["complete"]
+
+
+def test_sync_holds_pages_through_all_holds(tmpdir):
+    exchange, client, store = make_store(tmpdir)
+    account_id = exchange.accounts["USD"]["id"]
+    exchange.deposit("USD", 10000)
+    for _ in range(250):
+        client.limit_buy(client.ETH_USD, price=1, size=0.01)
+    store.sync(account_id)
+    holds = store.holds(account_id)
+    assert len(holds) == 250
+    assert sum(Decimal(h["amount"]) for h in holds) == Decimal("2.5")
+
+    client.cancel_all()
+    store.sync_holds(account_id)
+    assert store.holds(account_id) == []
+
+
+def test_sync_stops_at_api_errors(tmpdir, monkeypatch):
+    exchange, client, store = make_store(tmpdir)
+    account_id = exchange.accounts["USD"]["id"]
+    for _ in range(249):
+        exchange.deposit("USD", 1)
+    history = client.get_account_history
+    calls = []
+
+    def get_account_history(*args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 3:
+            return {"message": "Rate limit exceeded"}
+        return history(*args, **kwargs)
+    monkeypatch.setattr(client, "get_account_history", get_account_history)
+
+    # The newest page, an empty page of newer entries, then the error.
+    assert store.sync(account_id) == 100
+    checkpoint = store.checkpoint(account_id)
+    assert not checkpoint["complete"]
+    assert checkpoint["oldest_id"] == 151
+
+    assert store.sync(account_id) == 150
+    assert store.checkpoint(account_id)["complete"]
+    assert len(store.entries(account_id)) == 250
@@ -0,0 +1,135 @@
+import gdax
+
+
+class CountingClient(gdax.PrivateClient):
+
+    def __init__(self, exchange):
+        gdax.PrivateClient.__init__(self, "", "", "", session=exchange)
+        self.get_order_calls = 0
+        self.errors = {}
+        self.pages = None
+
+    def get_order(self, order_id):
+        self.get_order_calls += 1
+        if "get_order" in self.errors:
+            return self.errors["get_order"]
+        return gdax.PrivateClient.get_order(self, order_id)
+
+    def iter_orders(self, *args, **kwargs):
+        if "list_orders" in self.errors:
+            return iter([self.errors["list_orders"]])
+        if self.pages is not None:
+            return iter(self.pages)
+        return gdax.PrivateClient.iter_orders(self, *args, **kwargs)
+
+
+def make_tracker(**kwargs):
+    exchange = gdax.SimulatedExchange()
+    exchange.deposit("USD", 1000000)
+    exchange.deposit("ETH", 1000)
+    client = CountingClient(exchange)
+    return exchange, client, gdax.OrderTracker(client, **kwargs)
+
+
+def test_tracks_orders_placed_and_canceled():
+    exchange, client, tracker = make_tracker()
+    order = client.limit_buy(client.ETH_USD, 100, 1, client_oid="a")
+    assert tracker.status(order["id"]) == "open"
+    assert tracker.get_by_client_oid("a")["id"] == order["id"]
+
+    client.cancel_order(order["id"])
+    assert tracker.status(order["id"]) == "done"
+    assert tracker.get(order["id"])["done_reason"] == "canceled"
+
+
+def test_feed_updates():
+    exchange, client, tracker = make_tracker()
+    order = client.limit_buy(client.ETH_USD, 100, 1)
+    tracker.update({"type": "match", "maker_order_id": order["id"],
+                    "size": "0.25", "price": "100"})
+    assert tracker.get(order["id"])["filled_size"] == "0.25"
+    tracker.update({"type": "done", "order_id": order["id"],
+                    "reason": "filled"})
+    assert tracker.status(order["id"]) == "done"
+    assert tracker.open_orders() == []
+
+
+def test_reconcile_finds_fills_missed_by_the_feed():
+    exchange, client, tracker = make_tracker(interval=8)
+    order = client.limit_buy(client.ETH_USD, 100, 1)
+    exchange.place({"product_id": gdax.ETH_USD, "side": "sell",
+                    "type": "market", "size": "1"})
+
+    # The fill and the market order placed outside the client.
+    assert tracker.reconcile() == 2
+    assert tracker.get(order["id"])["done_reason"] == "filled"
+    assert tracker.interval == 4
+    assert tracker.reconcile() == 0
+    assert tracker.interval == 8
+
+
+def test_reconcile_pages_instead_of_polling_orders():
+    exchange, client, tracker = make_tracker()
+    ids = [client.limit_buy(client.ETH_USD, 100, 0.01)["id"]
+           for _ in range(250)]
+    exchange.place({"product_id": gdax.ETH_USD, "side": "sell",
+                    "type": "market", "size": "2.5"})
+
+    assert tracker.reconcile() == 251
+    assert client.get_order_calls == 0
+    assert all(tracker.status(order_id) == "done" for order_id in ids)
+
+
+def test_reconcile_errors_leave_state_alone():
+    exchange, client, tracker = make_tracker()
+    order = client.limit_buy(client.ETH_USD, 100, 1)
+    tracker.reconcile([])
+    client.errors["get_order"] = {"message": "Rate limit exceeded"}
+    assert tracker.reconcile([]) == 0
+    assert tracker.status(order["id"]) == "open"
+
+    client.errors["list_orders"] = {"message": "Rate limit exceeded"}
+    assert tracker.reconcile() is None
+    assert tracker.status(order["id"]) == "open"
+
+    client.errors = {"get_order": {"message": "NotFound"}}
+    assert tracker.reconcile([]) == 1
+    assert tracker.get(order["id"])["done_reason"] == "canceled"
+
+
+def test_done_orders_are_evicted():
+    exchange, client, tracker = make_tracker(max_done=10)
+    orders = [client.limit_buy(client.ETH_USD, 100, 1, client_oid=str(i))
+              for i in range(20)]
+    client.cancel_all()
+    assert tracker.get(orders[0]["id"]) is None
+    assert tracker.get_by_client_oid("0") is None
+    assert tracker.get(orders[-1]["id"])["status"] == "done"
+    assert len(tracker._orders) == 10
+
+
+def test_reconcile_compares_parsed_creation_times():
+    exchange, client, tracker = make_tracker()
+    tracker.track({"id": "a", "status": "open",
+                   "created_at": "2018-01-23T10:00:28.53864Z"})
+    # Newer than order a, but earlier as a string.
+    newer = {"id": "b", "status": "done",
+             "created_at": "2018-01-23T10:00:28.538644Z"}
+    client.pages = [[newer], [dict(newer, id="a")]]
+    assert tracker.reconcile() == 2
+    assert client.get_order_calls == 0
+    assert tracker.status("a") == "done"
+
+
+def test_reconcile_without_client():
+    tracker = gdax.OrderTracker()
+    assert tracker.reconcile() is None
+    assert tracker.reconcile([{"id": "a", "status": "open"}]) == 1
+
+
+def test_iter_orders_without_limit():
+    exchange, client, tracker = make_tracker()
+    for _ in range(150):
+        client.limit_buy(client.ETH_USD, 100, 0.01)
+    pages = list(client.iter_orders(limit=None))
+    assert [len(page) for page in pages] == [100, 50]
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+import gdax
+
+
+def make_rules():
+    return gdax.ProductRules([{
+        "id": gdax.ETH_USD, "quote_increment": "0.01",
+        "base_min_size": "0.01", "base_max_size": "5000"
+    }, {
+        "id": gdax.ETH_BTC, "quote_increment": "0.00001",
+        "base_min_size": "0.0000001", "base_max_size": "5000"
+    }])
+
+
+def test_prices_round_away_from_the_other_side():
+    rules = make_rules()
+    assert rules.normalize(gdax.ETH_USD, "buy", price="100.019") == {
+        "price": "100.01"}
+    assert rules.normalize(gdax.ETH_USD, "sell", price="100.011") == {
+        "price": "100.02"}
+    assert rules.normalize(gdax.ETH_USD, "buy", price=100.1) == {
+        "price": "100.1"}
+
+
+def test_stop_prices_round_away_from_the_market():
+    rules = make_rules()
+    assert rules.normalize(gdax.ETH_USD, "buy", price="100.011",
+                           type="stop") == {"price": "100.02"}
+    assert rules.normalize(gdax.ETH_USD, "sell", price="100.019",
+                           type="stop") == {"price": "100.01"}
+    order = rules.normalize_order({"product_id": gdax.ETH_USD, "side": "buy",
+                                   "type": "stop", "price": "100.011",
+                                   "size": "1"})
+    assert order["price"] == "100.02"
+
+
+def test_sizes_round_down_and_are_not_in_scientific_notation():
+    rules = make_rules()
+    result = rules.normalize(gdax.ETH_BTC, "buy", price="0.0000234",
+                             size="0.000000512")
+    assert result == {"price": "0.00002", "size": "0.00000051"}
+    result = rules.normalize(gdax.ETH_BTC, "buy", size="0.0000005")
+    assert result == {"size": "0.0000005"}
+    assert "E" not in rules.normalize_ladder(
+        gdax.ETH_BTC, "sell", ["0.00001"], "0.0000005")[0][1]
+
+
+def test_invalid_orders_raise():
+    rules = make_rules()
+    with pytest.raises(gdax.OrderValidationError):
+        rules.normalize(gdax.ETH_USD, "buy", size="0.001")
+    with pytest.raises(gdax.OrderValidationError):
+        rules.normalize(gdax.ETH_USD, "buy", size="5001")
+    with pytest.raises(gdax.OrderValidationError):
+        rules.normalize(gdax.ETH_USD, "buy", price="0.001")
+    with pytest.raises(gdax.OrderValidationError):
+        rules.normalize("XYZ-USD", "buy", size="1")
+
+
+def test_ladder():
+    rules = make_rules()
+    ladder = rules.normalize_ladder(gdax.ETH_USD, "buy",
+                                    [Decimal("100.005"), "99.999"], "0.123")
+    assert ladder == [("100.00", "0.123"), ("99.99", "0.123")]
+    with pytest.raises(gdax.OrderValidationError) as e:
+        rules.normalize_ladder(gdax.ETH_USD, "buy", ["100", "99"],
+                               ["1", "0.001"])
+    assert "order 1" in str(e.value)
@@ -0,0 +1,125 @@
+from decimal import Decimal
+
+import gdax
+
+
+def make_client(**kwargs):
+    exchange = gdax.SimulatedExchange(**kwargs)
+    exchange.deposit("USD", 10000)
+    exchange.deposit("ETH", 10)
+    exchange.load_book(gdax.ETH_USD, {
+        "sequence": 1,
+        "bids": [["1000.00", "2.0", 1], ["990.00", "5.0", 2]],
+        "asks": [["1010.00", "2.0", 1], ["1020.00", "5.0", 3]]
+    })
+    return exchange, gdax.PrivateClient("", "", "", session=exchange)
+
+
+def accounts(client):
+    return dict((a["currency"], a) for a in client.list_accounts())
+
+
+def test_book():
+    exchange, client = make_client()
+    book = gdax.PublicClient(session=exchange).get_product_order_book(
+        gdax.ETH_USD, 2)
+    assert book["bids"][0] == ["1000.00", "2.0", 1]
+    assert book["asks"][0] == ["1010.00", "2.0", 1]
+
+
+def test_limit_order_rests_and_fills():
+    exchange, client = make_client()
+    order = client.limit_buy(client.ETH_USD, price=1005, size=1)
+    assert order["status"] == "open"
+    assert accounts(client)["USD"]["hold"] == "1005"
+
+    client.market_sell(client.ETH_USD, size=0.5)
+    order = client.get_order(order["id"])
+    assert order["filled_size"] == "0.5"
+    assert order["status"] == "open"
+    assert accounts(client)["USD"]["hold"] == "502.5"
+
+    assert client.cancel_all() == [order["id"]]
+    assert client.get_order(order["id"])["done_reason"] == "canceled"
+    assert accounts(client)["USD"]["hold"] == "0.0"
+
+
+def test_market_order_out_of_liquidity_is_not_filled():
+    exchange, client = make_client()
+    order = client.market_buy(client.ETH_USD, size=10)
+    assert order["filled_size"] == "7.0"
+    assert order["size"] == "10"
+    assert order["done_reason"] == "canceled"
+
+    order = client.market_sell(client.ETH_USD, size=1)
+    assert order["done_reason"] == "filled"
+
+
+def test_market_sell_by_funds():
+    exchange, client = make_client()
+    order = client.market_sell(client.ETH_USD, funds=1500)
+    assert order["done_reason"] == "filled"
+    assert Decimal(order["executed_value"]) == 1500
+    assert Decimal(order["filled_size"]) == Decimal("1.5")
+    assert Decimal(accounts(client)["ETH"]["available"]) == Decimal("8.5")
+
+
+def test_market_sell_by_funds_is_bounded_by_the_hold():
+    exchange = gdax.SimulatedExchange()
+    exchange.deposit("ETH", 1)
+    exchange.load_book(gdax.ETH_USD, {"bids": [["100.00", "50.0", 1]],
+                                      "asks": []})
+    client = gdax.PrivateClient("", "", "", session=exchange)
+    order = client.market_sell(client.ETH_USD, funds=1000)
+    assert Decimal(order["filled_size"]) == 1
+    assert Decimal(order["executed_value"]) == 100
+    assert order["done_reason"] == "canceled"
+    eth = accounts(client)["ETH"]
+    assert Decimal(eth["balance"]) == 0
+    assert Decimal(eth["hold"]) == 0
+
+
+def test_invalid_orders_are_rejected():
+    exchange, client = make_client()
+    response = exchange.place({"product_id": gdax.ETH_USD, "side": "buy",
+                               "type": "limit", "price": "1", "funds": "10"})
+    assert response.status_code == 400
+    response = exchange.place({"product_id": gdax.ETH_USD, "side": "sell",
+                               "type": "stop", "size": "1"})
+    assert response.status_code == 400
+    response = exchange.place({"product_id": gdax.ETH_USD, "side": "sell",
+                               "type": "limit", "price": "x", "size": "1"})
+    assert response.status_code == 400
+    assert client.market_buy(client.ETH_USD, size=100000)["message"]
+
+
+def test_list_orders_pages_and_scans_open_orders(monkeypatch):
+    exchange, client = make_client()
+    ids = [client.limit_buy(client.ETH_USD, price=900, size=0.01)["id"]
+           for _ in range(150)]
+    for order_id in ids[:100]:
+        client.cancel_order(order_id)
+
+    first = exchange.get("/orders", params={"status": ["all"]})
+    second = exchange.get("/orders", params={
+        "status": ["all"], "after": first.headers["CB-AFTER"]})
+    assert [len(first.json()), len(second.json())] == [100, 50]
+    assert [o["id"] for o in first.json() + second.json()] == ids[::-1]
+    assert len(client.list_orders()) == 50
+
+    for _ in range(2000):
+        exchange.place({"product_id": gdax.ETH_USD, "side": "buy",
+                        "type": "limit", "price": "1", "size": "0.01",
+                        "time_in_force": "IOC"})
+    # Listing open orders reads the open order index instead of scanning
+    # the 2150 orders placed.
+    visited = []
+    scan = exchange._open_orders
+
+    def open_orders(product_id=None):
+        orders = scan(product_id)
+        visited.extend(orders)
+        return orders
+    monkeypatch.setattr(exchange, "_open_orders", open_orders)
+    assert len(client.list_orders()) == 50
+    assert len(visited) == 50